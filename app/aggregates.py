@@ -0,0 +1,253 @@
+"""Precomputed review-health statistics per developer and group"""
+import bisect
+import heapq
+import threading
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config import DEVELOPER_GROUPS, STALE_PR_DAYS
+from app.models import (
+    DurationStats, StalePR, DeveloperStats, GroupStats, PullRequest
+)
+
+PERCENTILES = (50, 90, 95)
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _hours(start: datetime, end: datetime) -> float:
+    return (_utc(end) - _utc(start)).total_seconds() / 3600
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile of already sorted values"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def duration_stats(sorted_values: Sequence[float]) -> DurationStats:
+    """Summarize sorted durations (in hours)"""
+    p50, p90, p95 = (percentile(sorted_values, pct) for pct in PERCENTILES)
+    return DurationStats(
+        count=len(sorted_values),
+        p50=p50,
+        p90=p90,
+        p95=p95,
+        max=sorted_values[-1] if sorted_values else None
+    )
+
+
+def relative_stats(sorted_timestamps: Sequence[float], now: float) -> DurationStats:
+    """
+    Summarize the hours from sorted epoch timestamps until `now`
+
+    Durations shrink as timestamps grow, so the p-th percentile duration is
+    measured from the (100 - p)-th percentile timestamp.
+    """
+    if not sorted_timestamps:
+        return DurationStats(count=0)
+    p50, p90, p95 = (
+        (now - percentile(sorted_timestamps, 100 - pct)) / 3600 for pct in PERCENTILES
+    )
+    return DurationStats(
+        count=len(sorted_timestamps),
+        p50=p50,
+        p90=p90,
+        p95=p95,
+        max=(now - sorted_timestamps[0]) / 3600
+    )
+
+
+def _signature(prs: Iterable[PullRequest]) -> tuple:
+    """Values the statistics depend on, used to detect unchanged developers"""
+    return tuple(
+        (
+            pr.id,
+            pr.created_at,
+            pr.first_comment_date,
+            pr.last_comment_date,
+            pr.review_comments.unresolved,
+        )
+        for pr in prs
+    )
+
+
+@dataclass
+class _Samples:
+    """
+    Sorted raw samples of a developer or group
+
+    Only values that do not depend on the current time are kept: creation
+    and comment timestamps rather than ages, so statistics stay correct
+    however long the data is cached.
+    """
+    open_prs: int = 0
+    unresolved: int = 0
+    without_comments: int = 0
+    created: array = field(default_factory=lambda: array("d"))
+    first_comment: array = field(default_factory=lambda: array("d"))
+    last_comment: array = field(default_factory=lambda: array("d"))
+    # (last activity timestamp, PR) sorted by last activity
+    activity: List[Tuple[float, StalePR]] = field(default_factory=list)
+
+
+class ReviewStatsAggregator:
+    """
+    Keeps per-developer and per-group review statistics up to date
+
+    Samples are recomputed when a developer's PRs are refreshed, and only
+    if the values they depend on changed. Groups containing a changed
+    developer are marked dirty and rebuilt once per batch by merging the
+    developers' presorted samples. Reading statistics only turns the stored
+    timestamps into durations relative to the current time.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self._groups = groups
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, tuple] = {}
+        self._samples: Dict[str, _Samples] = {}
+        self._group_samples: Dict[str, _Samples] = {}
+        self._dirty_groups = set()
+        self._stale_seconds = STALE_PR_DAYS * 86400
+
+    def update_developer(self, username: str, prs: List[PullRequest]) -> bool:
+        """
+        Recompute a developer's samples if their PRs changed
+
+        Returns:
+            True if the samples were recomputed
+        """
+        signature = _signature(prs)
+        with self._lock:
+            if self._signatures.get(username) == signature:
+                return False
+
+        samples = self._collect(username, prs)
+
+        with self._lock:
+            self._signatures[username] = signature
+            self._samples[username] = samples
+            self._dirty_groups.update(
+                group for group, members in self._groups.items() if username in members
+            )
+        return True
+
+    @staticmethod
+    def _collect(username: str, prs: List[PullRequest]) -> _Samples:
+        created, first_comment, last_comment = [], [], []
+        samples = _Samples(open_prs=len(prs))
+
+        for pr in prs:
+            created.append(_utc(pr.created_at).timestamp())
+            samples.unresolved += pr.review_comments.unresolved
+
+            if pr.first_comment_date is not None:
+                first_comment.append(_hours(pr.created_at, pr.first_comment_date))
+            else:
+                samples.without_comments += 1
+
+            last_activity = pr.last_comment_date or pr.created_at
+            if pr.last_comment_date is not None:
+                last_comment.append(_utc(pr.last_comment_date).timestamp())
+
+            samples.activity.append((_utc(last_activity).timestamp(), StalePR(
+                username=username,
+                id=pr.id,
+                number=pr.number,
+                title=pr.title,
+                repository=pr.repository,
+                url=pr.url,
+                idle_hours=0.0
+            )))
+
+        samples.created = array("d", sorted(created))
+        samples.first_comment = array("d", sorted(first_comment))
+        samples.last_comment = array("d", sorted(last_comment))
+        samples.activity.sort(key=lambda item: item[0])
+        return samples
+
+    @staticmethod
+    def _merge(samples: List[_Samples]) -> _Samples:
+        """Combine presorted samples of several developers"""
+        def merged(attribute: str) -> array:
+            return array("d", heapq.merge(*(getattr(s, attribute) for s in samples)))
+
+        return _Samples(
+            open_prs=sum(s.open_prs for s in samples),
+            unresolved=sum(s.unresolved for s in samples),
+            without_comments=sum(s.without_comments for s in samples),
+            created=merged("created"),
+            first_comment=merged("first_comment"),
+            last_comment=merged("last_comment"),
+            activity=list(heapq.merge(*(s.activity for s in samples), key=lambda item: item[0]))
+        )
+
+    def _summarize(self, samples: _Samples, now: datetime) -> dict:
+        """Build the shared statistics fields as of `now`"""
+        now_ts = now.timestamp()
+        # Activity is sorted oldest first, so the stale PRs are a prefix
+        stale_before = bisect.bisect_right(
+            samples.activity, now_ts - self._stale_seconds, key=lambda item: item[0]
+        )
+        return {
+            "open_prs": samples.open_prs,
+            "unresolved_comments": samples.unresolved,
+            "prs_without_comments": samples.without_comments,
+            "pr_age_hours": relative_stats(samples.created, now_ts),
+            "time_to_first_comment_hours": duration_stats(samples.first_comment),
+            "hours_since_last_comment": relative_stats(samples.last_comment, now_ts),
+            "stale_prs": [
+                pr.model_copy(update={"idle_hours": (now_ts - last_activity) / 3600})
+                for last_activity, pr in samples.activity[:stale_before]
+            ],
+            "computed_at": now,
+        }
+
+    def flush(self):
+        """Rebuild the samples of groups whose developers changed"""
+        with self._lock:
+            dirty, self._dirty_groups = self._dirty_groups, set()
+            for group in dirty:
+                self._group_samples[group] = self._merge([
+                    self._samples[m] for m in self._groups[group] if m in self._samples
+                ])
+
+    def get_developer_stats(self, username: str, now: Optional[datetime] = None) -> Optional[DeveloperStats]:
+        """Get statistics of a developer as of now"""
+        samples = self._samples.get(username)
+        if samples is None:
+            return None
+        return DeveloperStats(
+            username=username,
+            **self._summarize(samples, now or datetime.now(timezone.utc))
+        )
+
+    def get_group_stats(self, group: str, now: Optional[datetime] = None) -> Optional[GroupStats]:
+        """Get statistics of a group as of now"""
+        if group in self._dirty_groups:
+            self.flush()
+        samples = self._group_samples.get(group)
+        if samples is None:
+            return None
+        now = now or datetime.now(timezone.utc)
+        return GroupStats(
+            group=group,
+            developers=[
+                self.get_developer_stats(m, now) for m in self._groups[group] if m in self._samples
+            ],
+            **self._summarize(samples, now)
+        )
+
+
+# Global aggregator instance
+review_stats = ReviewStatsAggregator(DEVELOPER_GROUPS)
@@ -45,10 +45,8 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenData:
-    """Verify and decode JWT token"""
-    token = credentials.credentials
-    
+def decode_token(token: str) -> TokenData:
+    """Decode a JWT token, raising 401 if it is invalid or expired"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -75,6 +73,11 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
         raise credentials_exception
 
 
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenData:
+    """Verify and decode JWT token"""
+    return decode_token(credentials.credentials)
+
+
 async def get_current_user(token_data: TokenData = Depends(verify_token)) -> UserInfo:
     """Get current user from token"""
     return UserInfo(
@@ -1,9 +1,11 @@
 """Simple in-memory cache with TTL support"""
 
+import threading
 import time
-from typing import Any, Dict, Optional, Callable
+from typing import Any, Dict, Hashable, Iterable, Optional, Callable, Set
 from functools import wraps
 import hashlib
+import inspect
 import json
 import logging
 
@@ -11,63 +13,118 @@ logger = logging.getLogger(__name__)
 
 
 class Cache:
-    """Simple in-memory cache with TTL support"""
+    """
+    Simple in-memory cache with TTL support
+    
+    Entries can carry tags (e.g. "developer:alice") so related entries can be
+    invalidated together without clearing the whole cache.
+    """
     
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, name: str = "default", durable: bool = False):
+        self.name = name
+        # Durable caches are skipped by clear_all and unscoped invalidation
+        self.durable = durable
+        # Service calls run on threadpool workers, so access is serialized
+        self._lock = threading.RLock()
+        self._cache: Dict[Hashable, Dict[str, Any]] = {}
+        self._tags: Dict[str, Set[Hashable]] = {}
         self._stats = {
             "hits": 0,
             "misses": 0,
             "sets": 0,
-            "evictions": 0
+            "evictions": 0,
+            "invalidations": 0
         }
     
-    def get(self, key: str) -> Optional[Any]:
+    def _remove(self, key: Hashable):
+        """Remove an entry and its tag references"""
+        entry = self._cache.pop(key)
+        for tag in entry["tags"]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+    
+    def get(self, key: Hashable) -> Optional[Any]:
         """Get value from cache if not expired"""
-        if key in self._cache:
-            entry = self._cache[key]
-            if time.time() < entry["expires_at"]:
-                self._stats["hits"] += 1
-                logger.debug(f"Cache hit for key: {key}")
-                return entry["value"]
-            else:
-                # Expired, remove from cache
-                del self._cache[key]
-                self._stats["evictions"] += 1
-                logger.debug(f"Cache expired for key: {key}")
+        with self._lock:
+            if key in self._cache:
+                entry = self._cache[key]
+                if time.time() < entry["expires_at"]:
+                    self._stats["hits"] += 1
+                    logger.debug(f"Cache hit for key: {key}")
+                    return entry["value"]
+                else:
+                    # Expired, remove from cache
+                    self._remove(key)
+                    self._stats["evictions"] += 1
+                    logger.debug(f"Cache expired for key: {key}")
         
-        self._stats["misses"] += 1
-        return None
-    
-    def set(self, key: str, value: Any, ttl_seconds: int):
-        """Set value in cache with TTL"""
-        self._cache[key] = {
-            "value": value,
-            "expires_at": time.time() + ttl_seconds,
-            "created_at": time.time()
-        }
-        self._stats["sets"] += 1
-        logger.debug(f"Cache set for key: {key}, TTL: {ttl_seconds}s")
+            self._stats["misses"] += 1
+            return None
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: int, tags: Iterable[str] = ()):
+        """Set value in cache with TTL and optional invalidation tags"""
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            tags = frozenset(tags)
+            self._cache[key] = {
+                "value": value,
+                "expires_at": time.time() + ttl_seconds,
+                "created_at": time.time(),
+                "tags": tags
+            }
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self._stats["sets"] += 1
+            logger.debug(f"Cache set for key: {key}, TTL: {ttl_seconds}s")
+    
+    def delete(self, key: Hashable) -> bool:
+        """Remove a single entry"""
+        with self._lock:
+            if key not in self._cache:
+                return False
+            self._remove(key)
+            self._stats["invalidations"] += 1
+            return True
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """Remove all entries carrying any of the given tags"""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self._stats["invalidations"] += len(keys)
+            if keys:
+                logger.info(f"Invalidated {len(keys)} entries in cache '{self.name}' for tags: {', '.join(tags)}")
+            return len(keys)
     
     def clear(self):
         """Clear all cache entries"""
-        self._cache.clear()
-        logger.info("Cache cleared")
+        with self._lock:
+            self._cache.clear()
+            self._tags.clear()
+            logger.info(f"Cache '{self.name}' cleared")
     
     def cleanup_expired(self):
         """Remove expired entries from cache"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if current_time >= entry["expires_at"]
-        ]
+        with self._lock:
+            current_time = time.time()
+            expired_keys = [
+                key for key, entry in self._cache.items()
+                if current_time >= entry["expires_at"]
+            ]
         
-        for key in expired_keys:
-            del self._cache[key]
-            self._stats["evictions"] += 1
+            for key in expired_keys:
+                self._remove(key)
+                self._stats["evictions"] += 1
         
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+            if expired_keys:
+                logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -81,8 +138,62 @@ class Cache:
         }
 
 
-# Global cache instance
-cache = Cache()
+# Named cache namespaces
+_namespaces: Dict[str, Cache] = {}
+
+
+def get_cache(namespace: str, durable: bool = False) -> Cache:
+    """
+    Get (or create) the cache of a namespace
+    
+    Durable namespaces, like the last good data served when GitHub fails, are
+    only cleared or invalidated when they are named explicitly.
+    """
+    if namespace not in _namespaces:
+        _namespaces[namespace] = Cache(namespace, durable=durable)
+    return _namespaces[namespace]
+
+
+def get_namespaces() -> Dict[str, Cache]:
+    """Get all cache namespaces by name"""
+    return dict(_namespaces)
+
+
+def invalidate_tags(*tags: str) -> Dict[str, int]:
+    """Invalidate tagged entries in every non-durable namespace, returns counts per namespace"""
+    return {
+        name: c.invalidate_tags(*tags)
+        for name, c in get_namespaces().items()
+        if not c.durable
+    }
+
+
+def clear_all():
+    """Clear every non-durable namespace"""
+    for c in get_namespaces().values():
+        if not c.durable:
+            c.clear()
+
+
+def get_all_stats() -> Dict[str, Any]:
+    """Get combined statistics and per-namespace statistics"""
+    namespaces = {name: c.get_stats() for name, c in get_namespaces().items()}
+    totals = {
+        stat: sum(stats[stat] for stats in namespaces.values())
+        for stat in ("hits", "misses", "sets", "evictions", "invalidations", "size")
+    }
+    total_requests = totals["hits"] + totals["misses"]
+    hit_rate = (totals["hits"] / total_requests * 100) if total_requests > 0 else 0
+    
+    return {
+        **totals,
+        "hit_rate": f"{hit_rate:.1f}%",
+        "namespaces": namespaces
+    }
+
+
+# Global cache instance (default namespace)
+cache = get_cache("default")
 
 
 def cache_key(*args, **kwargs) -> str:
@@ -98,35 +209,82 @@ def cache_key(*args, **kwargs) -> str:
     return hashlib.md5(key_str.encode()).hexdigest()
 
 
-def cached(ttl_seconds: int = 1800):  # Default 30 minutes
+_KWARGS_MARK = object()
+
+
+def make_key(args: tuple, kwargs: dict) -> Hashable:
+    """
+    Build a cache key from call arguments without serializing them
+    
+    Hashable arguments are used as they are (like functools.lru_cache does),
+    unhashable ones fall back to the JSON/MD5 `cache_key`.
+    """
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(kwargs.items())
+    if len(key) == 1 and type(key[0]) in (str, int):
+        key = key[0]
+    try:
+        hash(key)
+    except TypeError:
+        return cache_key(*args, **kwargs)
+    return key
+
+
+def cached(ttl_seconds: int = 1800, namespace: Optional[str] = None):  # Default 30 minutes
     """
     Decorator to cache function results with TTL
     
+    Works for regular functions and coroutines. Each decorated function gets
+    its own namespace (module and qualified name) unless one is given, so
+    `cache_clear` only drops that function's entries.
+    
     Args:
         ttl_seconds: Time to live in seconds (default 30 minutes)
+        namespace: Optional cache namespace to store results in
     """
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            key = f"{func.__name__}:{cache_key(*args, **kwargs)}"
-            
-            # Try to get from cache
-            cached_value = cache.get(key)
-            if cached_value is not None:
-                return cached_value
-            
-            # Cache miss, call the function
-            result = func(*args, **kwargs)
-            
-            # Store in cache
-            cache.set(key, result, ttl_seconds)
-            
-            return result
+        func_cache = get_cache(namespace or f"{func.__module__}.{func.__qualname__}")
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                
+                # Try to get from cache
+                cached_value = func_cache.get(key)
+                if cached_value is not None:
+                    return cached_value
+                
+                # Cache miss, await the coroutine
+                result = await func(*args, **kwargs)
+                
+                # Store in cache
+                func_cache.set(key, result, ttl_seconds)
+                
+                return result
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                
+                # Try to get from cache
+                cached_value = func_cache.get(key)
+                if cached_value is not None:
+                    return cached_value
+                
+                # Cache miss, call the function
+                result = func(*args, **kwargs)
+                
+                # Store in cache
+                func_cache.set(key, result, ttl_seconds)
+                
+                return result
         
         # Add cache control methods to the wrapper
-        wrapper.cache_clear = lambda: cache.clear()
-        wrapper.cache_stats = lambda: cache.get_stats()
+        wrapper.cache_clear = func_cache.clear
+        wrapper.cache_stats = func_cache.get_stats
+        wrapper.cache = func_cache
         
         return wrapper
     return decorator
@@ -136,7 +294,8 @@ def cached(ttl_seconds: int = 1800):  # Default 30 minutes
 async def cleanup_cache_periodically():
     """Clean up expired cache entries periodically"""
     while True:
-        cache.cleanup_expired()
+        for namespace_cache in get_namespaces().values():
+            namespace_cache.cleanup_expired()
         # Sleep for 5 minutes
         await asyncio.sleep(300)
 
@@ -0,0 +1,279 @@
+"""Versioned log of PR changes for delta polling"""
+import pickle
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.compact import CompactPR
+from app.config import CHANGELOG_MAX_ENTRIES, LEADER_DB_PATH
+from app.leader import connect
+
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+
+@dataclass(frozen=True)
+class Change:
+    version: int
+    username: str
+    change: str
+    pr_id: int
+    record: Optional[CompactPR]
+
+
+def _state(record: CompactPR) -> tuple:
+    return tuple(getattr(record, slot) for slot in CompactPR.__slots__)
+
+
+def diff(
+    username: str,
+    previous: Dict[int, CompactPR],
+    current: Dict[int, CompactPR],
+    version: int
+) -> List[Change]:
+    """Changes from one refresh of a developer's PRs to the next, all at `version`"""
+    changes = []
+    for pr_id, record in current.items():
+        old = previous.get(pr_id)
+        if old is None:
+            changes.append(Change(version, username, ADDED, pr_id, record))
+        elif old is not record and _state(old) != _state(record):
+            changes.append(Change(version, username, CHANGED, pr_id, record))
+    for pr_id in previous.keys() - current.keys():
+        changes.append(Change(version, username, REMOVED, pr_id, None))
+    return changes
+
+
+def coalesce(newest_first: Iterable[Change], version: int) -> List[Change]:
+    """Latest state per PR among the changes after `version`, in version order"""
+    latest: Dict[tuple, Change] = {}
+    first_change: Dict[tuple, str] = {}
+    for change in newest_first:
+        if change.version <= version:
+            break
+        key = (change.username, change.pr_id)
+        latest.setdefault(key, change)
+        first_change[key] = change.change
+
+    coalesced = []
+    for key, change in latest.items():
+        # A PR added after `version` is new to the client even if it changed since
+        if change.change == CHANGED and first_change[key] == ADDED:
+            change = Change(change.version, change.username, ADDED, change.pr_id, change.record)
+        coalesced.append(change)
+    # Back to log order, which is also version order
+    coalesced.reverse()
+    return coalesced
+
+
+class ChangeLog:
+    """
+    Records which PRs were added, changed or removed by each refresh
+
+    Every refresh that changes something gets the next version number, and
+    clients ask for everything after the version they last saw. Only the
+    last `max_entries` changes are kept; older versions, or versions from
+    another process (identified by `epoch`), require a full resync.
+    """
+
+    def __init__(self, max_entries: int = CHANGELOG_MAX_ENTRIES):
+        self.epoch = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._version = 0
+        self._evicted_through = 0
+        self._entries: Deque[Change] = deque()
+        self._max_entries = max_entries
+        self._snapshots: Dict[str, Dict[int, CompactPR]] = {}
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def position(self) -> Tuple[int, str]:
+        """Current version and epoch, to read before loading the data they describe"""
+        return self._version, self.epoch
+
+    def record_refresh(self, username: str, records: Sequence[CompactPR]) -> List[Change]:
+        """
+        Diff a developer's refreshed PRs against the previous refresh
+
+        Returns:
+            The changes, all sharing one new version (empty if nothing changed)
+        """
+        with self._lock:
+            previous = self._snapshots.get(username, {})
+            current = {record.id: record for record in records}
+            version = self._version + 1
+            changes = diff(username, previous, current, version)
+
+            self._snapshots[username] = current
+            if not changes:
+                return []
+
+            self._version = version
+            for change in changes:
+                if len(self._entries) >= self._max_entries:
+                    self._evicted_through = self._entries.popleft().version
+                self._entries.append(change)
+            return changes
+
+    def since(self, version: int, epoch: Optional[str] = None) -> Optional[List[Change]]:
+        """
+        Changes after `version`, coalesced to the latest state per PR
+
+        Returns:
+            The changes, or None if the client must do a full resync
+        """
+        with self._lock:
+            if (epoch is not None and epoch != self.epoch) or version > self._version:
+                return None
+            if version < self._evicted_through:
+                return None
+
+            return coalesce(reversed(self._entries), version)
+
+
+class SharedChangeLog(ChangeLog):
+    """
+    Change log kept in the coordination database, shared by all processes
+
+    Versions, the epoch and the last recorded PRs of every developer live in
+    SQLite, so a version returned by one worker is valid on all of them and
+    the same refresh applied by several workers is recorded once.
+    `record_refresh` returns the developer's changes this process has not
+    returned before, whoever recorded them, so every process can push them
+    to its own subscribers.
+    """
+
+    def __init__(self, path: str, max_entries: int = CHANGELOG_MAX_ENTRIES):
+        self.path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._epoch: Optional[str] = None
+        # Version of each developer's changes this process last returned
+        self._returned: Dict[str, int] = {}
+
+    def _connect(self):
+        connection = connect(self.path)
+        connection.execute(
+            "INSERT OR IGNORE INTO changelog (id, epoch, version, evicted_through) VALUES (1, ?, 0, 0)",
+            (uuid.uuid4().hex,)
+        )
+        return connection
+
+    def _head(self, connection) -> tuple:
+        return connection.execute(
+            "SELECT epoch, version, evicted_through FROM changelog WHERE id = 1"
+        ).fetchone()
+
+    @property
+    def epoch(self) -> str:
+        if self._epoch is None:
+            connection = self._connect()
+            try:
+                self._epoch = self._head(connection)[0]
+            finally:
+                connection.close()
+        return self._epoch
+
+    @property
+    def version(self) -> int:
+        connection = self._connect()
+        try:
+            return self._head(connection)[1]
+        finally:
+            connection.close()
+
+    def position(self) -> Tuple[int, str]:
+        connection = self._connect()
+        try:
+            epoch, version, _ = self._head(connection)
+        finally:
+            connection.close()
+        self._epoch = epoch
+        return version, epoch
+
+    def _changes_after(self, connection, version: int, username: Optional[str] = None) -> List[Change]:
+        query = "SELECT version, username, change, pr_id, record FROM changes WHERE version > ?"
+        params: tuple = (version,)
+        if username is not None:
+            query += " AND username = ?"
+            params += (username,)
+        rows = connection.execute(query + " ORDER BY seq DESC", params).fetchall()
+        return coalesce(
+            (
+                Change(row[0], row[1], row[2], row[3], pickle.loads(row[4]) if row[4] else None)
+                for row in rows
+            ),
+            version
+        )
+
+    def record_refresh(self, username: str, records: Sequence[CompactPR]) -> List[Change]:
+        current = {record.id: record for record in records}
+        with self._lock:
+            connection = self._connect()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                row = connection.execute(
+                    "SELECT records, version FROM change_states WHERE username = ?", (username,)
+                ).fetchone()
+                previous, recorded = (pickle.loads(row[0]), row[1]) if row else ({}, 0)
+                returned = self._returned.get(username, recorded)
+
+                version = self._head(connection)[1] + 1
+                changes = diff(username, previous, current, version)
+                latest = recorded
+                if changes:
+                    connection.executemany(
+                        "INSERT INTO changes (version, username, change, pr_id, record) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (c.version, c.username, c.change, c.pr_id,
+                             pickle.dumps(c.record) if c.record else None)
+                            for c in changes
+                        ]
+                    )
+                    self._evict(connection)
+                    connection.execute("UPDATE changelog SET version = ? WHERE id = 1", (version,))
+                    connection.execute(
+                        "INSERT OR REPLACE INTO change_states (username, records, version) VALUES (?, ?, ?)",
+                        (username, pickle.dumps(current), version)
+                    )
+                    latest = version
+
+                # Add the changes other processes recorded since this one last returned any
+                if returned < recorded:
+                    changes = self._changes_after(connection, returned, username)
+                connection.execute("COMMIT")
+            finally:
+                connection.close()
+            self._returned[username] = latest
+            return changes
+
+    def _evict(self, connection):
+        row = connection.execute(
+            "SELECT seq, version FROM changes ORDER BY seq DESC LIMIT 1 OFFSET ?",
+            (self._max_entries,)
+        ).fetchone()
+        if row is not None:
+            connection.execute("DELETE FROM changes WHERE seq <= ?", (row[0],))
+            connection.execute("UPDATE changelog SET evicted_through = ? WHERE id = 1", (row[1],))
+
+    def since(self, version: int, epoch: Optional[str] = None) -> Optional[List[Change]]:
+        connection = self._connect()
+        try:
+            current_epoch, current_version, evicted_through = self._head(connection)
+            if (epoch is not None and epoch != current_epoch) or version > current_version:
+                return None
+            if version < evicted_through:
+                return None
+            return self._changes_after(connection, version)
+        finally:
+            connection.close()
+
+
+# Global change log instance, shared between processes when they coordinate
+change_log = SharedChangeLog(LEADER_DB_PATH) if LEADER_DB_PATH else ChangeLog()
@@ -0,0 +1,128 @@
+"""Compact in-memory representation of cached PR data"""
+import sys
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from app.models import PullRequest, ReviewComments
+
+GITHUB_URL = "https://github.com"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _datetime(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
+
+
+class CompactPR:
+    """
+    Slotted record holding one cached PR
+
+    Repository, state and login strings are interned so they are shared by
+    every record, dates are stored as epoch floats, the comment counts are
+    flattened and the URL is only kept when it cannot be derived from the
+    repository and number. Records are immutable once built and are turned
+    into `PullRequest` models only when a response is rendered.
+    """
+
+    __slots__ = (
+        "id", "number", "title", "repository", "url", "state",
+        "total_comments", "resolved_comments", "unresolved_comments",
+        "reviewers", "created_ts", "first_comment_ts", "last_comment_ts",
+        "last_comment_by",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        number: int,
+        title: str,
+        repository: str,
+        url: Optional[str],
+        state: str,
+        total_comments: int,
+        resolved_comments: int,
+        unresolved_comments: int,
+        reviewers: Tuple[str, ...],
+        created_ts: float,
+        first_comment_ts: Optional[float] = None,
+        last_comment_ts: Optional[float] = None,
+        last_comment_by: Optional[str] = None
+    ):
+        self.id = id
+        self.number = number
+        self.title = title
+        self.repository = repository
+        self.url = url
+        self.state = state
+        self.total_comments = total_comments
+        self.resolved_comments = resolved_comments
+        self.unresolved_comments = unresolved_comments
+        self.reviewers = reviewers
+        self.created_ts = created_ts
+        self.first_comment_ts = first_comment_ts
+        self.last_comment_ts = last_comment_ts
+        self.last_comment_by = last_comment_by
+
+    @classmethod
+    def from_model(cls, pr: PullRequest) -> "CompactPR":
+        """Build a compact record from an API model"""
+        repository = sys.intern(pr.repository)
+        url = pr.url if pr.url != f"{GITHUB_URL}/{repository}/pull/{pr.number}" else None
+        return cls(
+            id=pr.id,
+            number=pr.number,
+            title=pr.title,
+            repository=repository,
+            url=url,
+            state=sys.intern(pr.state),
+            total_comments=pr.review_comments.total,
+            resolved_comments=pr.review_comments.resolved,
+            unresolved_comments=pr.review_comments.unresolved,
+            reviewers=tuple(sys.intern(reviewer) for reviewer in pr.reviewers),
+            created_ts=_timestamp(pr.created_at),
+            first_comment_ts=_timestamp(pr.first_comment_date),
+            last_comment_ts=_timestamp(pr.last_comment_date),
+            last_comment_by=_intern(pr.last_comment_by)
+        )
+
+    def to_model(self) -> PullRequest:
+        """Build the API model, skipping validation since the data is trusted"""
+        return PullRequest.model_construct(
+            id=self.id,
+            number=self.number,
+            title=self.title,
+            repository=self.repository,
+            created_at=_datetime(self.created_ts),
+            url=self.url or f"{GITHUB_URL}/{self.repository}/pull/{self.number}",
+            state=self.state,
+            review_comments=ReviewComments.model_construct(
+                total=self.total_comments,
+                resolved=self.resolved_comments,
+                unresolved=self.unresolved_comments
+            ),
+            reviewers=list(self.reviewers),
+            first_comment_date=_datetime(self.first_comment_ts),
+            last_comment_date=_datetime(self.last_comment_ts),
+            last_comment_by=self.last_comment_by
+        )
+
+
+def compact_prs(prs: Iterable[PullRequest]) -> Tuple[CompactPR, ...]:
+    """Convert API models to a tuple of compact records"""
+    return tuple(CompactPR.from_model(pr) for pr in prs)
+
+
+def expand_prs(records: Iterable[CompactPR]) -> List[PullRequest]:
+    """Convert compact records back to API models"""
+    return [record.to_model() for record in records]
@@ -4,6 +4,55 @@ import os
 # GitHub organization to search for PRs
 GITHUB_ORGANIZATION = os.getenv("GITHUB_ORGANIZATION", "Realtyka")
 
+# GitHub organizations to search for PRs (comma-separated, defaults to GITHUB_ORGANIZATION).
+# An organization can use its own token through GITHUB_TOKEN_<ORG>, e.g. GITHUB_TOKEN_REALTYKA.
+GITHUB_ORGANIZATIONS = os.getenv("GITHUB_ORGANIZATIONS", GITHUB_ORGANIZATION).split(",")
+GITHUB_ORGANIZATIONS = list(dict.fromkeys(org.strip() for org in GITHUB_ORGANIZATIONS if org.strip()))
+
+# Retry and circuit breaker settings for GitHub API calls
+GITHUB_RETRY_ATTEMPTS = int(os.getenv("GITHUB_RETRY_ATTEMPTS", "3"))
+GITHUB_RETRY_BASE_DELAY = float(os.getenv("GITHUB_RETRY_BASE_DELAY", "1"))
+GITHUB_RETRY_MAX_DELAY = float(os.getenv("GITHUB_RETRY_MAX_DELAY", "10"))
+GITHUB_BREAKER_THRESHOLD = int(os.getenv("GITHUB_BREAKER_THRESHOLD", "5"))
+GITHUB_BREAKER_RESET_SECONDS = float(os.getenv("GITHUB_BREAKER_RESET_SECONDS", "60"))
+
+# How PRs are fetched: "author" (search per developer), "repository" (bulk per
+# repository for all developers) or "auto" (the cheaper one by measured calls)
+GITHUB_FETCH_STRATEGY = os.getenv("GITHUB_FETCH_STRATEGY", "auto").strip().lower()
+
+# How long the last good PR data is kept to be served when GitHub fails
+LAST_GOOD_TTL_SECONDS = int(os.getenv("LAST_GOOD_TTL_SECONDS", "86400"))
+# How long stale data is served before GitHub is tried again
+STALE_RETRY_SECONDS = int(os.getenv("STALE_RETRY_SECONDS", "120"))
+
+# Adaptive refresh: per-developer cache TTL bounds and the hourly GitHub call budget
+REFRESH_MIN_TTL_SECONDS = int(os.getenv("REFRESH_MIN_TTL_SECONDS", "300"))
+REFRESH_MAX_TTL_SECONDS = int(os.getenv("REFRESH_MAX_TTL_SECONDS", "7200"))
+REFRESH_DEFAULT_TTL_SECONDS = int(os.getenv("REFRESH_DEFAULT_TTL_SECONDS", "1800"))
+REFRESH_CALL_BUDGET_PER_HOUR = int(os.getenv("REFRESH_CALL_BUDGET_PER_HOUR", "3000"))
+
+# Number of PR changes kept for delta polling
+CHANGELOG_MAX_ENTRIES = int(os.getenv("CHANGELOG_MAX_ENTRIES", "5000"))
+
+# Messages queued per WebSocket client before it must resync
+SUBSCRIPTION_QUEUE_SIZE = int(os.getenv("SUBSCRIPTION_QUEUE_SIZE", "100"))
+# How often the background refresh checks for expired developers
+REFRESH_CHECK_SECONDS = int(os.getenv("REFRESH_CHECK_SECONDS", "60"))
+
+# Leader election and the change log between workers and instances sharing
+# this SQLite file (set LEADER_DB_PATH to an empty string to make every process its own leader)
+LEADER_DB_PATH = os.getenv("LEADER_DB_PATH", "data/coordination.db")
+LEADER_LEASE_SECONDS = int(os.getenv("LEADER_LEASE_SECONDS", "30"))
+
+# PR history store (set HISTORY_PATH to an empty string to disable)
+HISTORY_PATH = os.getenv("HISTORY_PATH", "data/pr_history.bin")
+HISTORY_HOURLY_AFTER_DAYS = int(os.getenv("HISTORY_HOURLY_AFTER_DAYS", "7"))
+HISTORY_DAILY_AFTER_DAYS = int(os.getenv("HISTORY_DAILY_AFTER_DAYS", "30"))
+HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "365"))
+
+# PRs without any activity for this many days are reported as stale
+STALE_PR_DAYS = float(os.getenv("STALE_PR_DAYS", "3"))
+
 # Developer groups mapping
 DEVELOPER_GROUPS = {
     "brokerage": ["ankushchoubey-realbrokerage", "ronak-real"],
@@ -1,20 +1,150 @@
 """GitHub API service for fetching PR data"""
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set, Tuple
 from github import Github, GithubException
 from github.PullRequest import PullRequest as GithubPR
 from dotenv import load_dotenv
 import logging
 
 from app.models import PullRequest, ReviewComments, DeveloperPRs
-from app.config import GITHUB_ORGANIZATION
-from app.cache import cache
+from app.config import (
+    GITHUB_ORGANIZATIONS, LAST_GOOD_TTL_SECONDS, STALE_RETRY_SECONDS,
+    REFRESH_DEFAULT_TTL_SECONDS, DEVELOPERS
+)
+from app.cache import get_cache, invalidate_tags, clear_all
+from app.indexes import pr_index
+from app.history import history
+from app.aggregates import review_stats
+from app.compact import CompactPR, compact_prs, expand_prs
+from app.resilience import ResilientCaller, CircuitOpenError
+from app.refresh import refresh_scheduler
+from app.changes import change_log
+from app.subscriptions import subscription_hub
+from app.leader import leader_elector, snapshot_store
+from app.strategy import AUTHOR, REPOSITORY, PER_PAGE, fetch_strategy, pages
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Cache namespaces for per-developer and aggregated PR data
+prs_cache = get_cache("prs")
+all_prs_cache = get_cache("all_prs")
+# Last successfully fetched data, served instead of failures
+last_good_cache = get_cache("last_good", durable=True)
+
+
+# Followers re-read a snapshot at least this often while waiting for the leader
+SNAPSHOT_MIN_TTL_SECONDS = 30
+# Developers combined into one search when looking for their repositories
+SEARCH_AUTHORS_PER_QUERY = 5
+
+
+def developer_tags(username: str, records) -> List[str]:
+    """Invalidation tags for a developer's cached PR records"""
+    tags = {f"developer:{username}"}
+    tags.update(f"repository:{record.repository.lower()}" for record in records)
+    return sorted(tags)
+
+
+def records_signature(records) -> int:
+    """Hash of the PR values a refresh can change"""
+    return hash(tuple(
+        (r.id, r.title, r.total_comments, r.unresolved_comments, r.last_comment_ts)
+        for r in records
+    ))
+
+
+def summarize_comments(review_comments, issue_comments) -> Dict[str, Any]:
+    """Process PR review and issue comments to get counts and dates"""
+    resolved = 0
+    unresolved = 0
+    reviewers = set()
+    first_comment = None
+    last_comment = None
+    last_comment_by = None
+    
+    try:
+        # Get review comments
+        for comment in review_comments:
+            reviewers.add(comment.user.login)
+            
+            # Track first and last comment dates
+            if not first_comment or comment.created_at < first_comment:
+                first_comment = comment.created_at
+            if not last_comment or comment.created_at > last_comment:
+                last_comment = comment.created_at
+                last_comment_by = comment.user.login
+            
+            # Check if comment is resolved (simplified logic)
+            # In real implementation, you'd check for reactions, replies, etc.
+            if comment.position is None:  # Outdated comments are marked as resolved
+                resolved += 1
+            else:
+                unresolved += 1
+        
+        # Also get issue comments (general PR comments)
+        for comment in issue_comments:
+            reviewers.add(comment.user.login)
+            if not first_comment or comment.created_at < first_comment:
+                first_comment = comment.created_at
+            if not last_comment or comment.created_at > last_comment:
+                last_comment = comment.created_at
+                last_comment_by = comment.user.login
+            
+    except Exception as e:
+        logger.error(f"Error processing PR comments: {e}")
+    
+    return {
+        "total": resolved + unresolved,
+        "resolved": resolved,
+        "unresolved": unresolved,
+        "reviewers": list(reviewers),
+        "first_comment_date": first_comment,
+        "last_comment_date": last_comment,
+        "last_comment_by": last_comment_by
+    }
+
+
+def build_pr_model(pr: GithubPR, comment_data: Dict[str, Any]) -> PullRequest:
+    """Create a PR model from a GitHub PR and its summarized comments"""
+    return PullRequest(
+        id=pr.id,
+        number=pr.number,
+        title=pr.title,
+        repository=pr.base.repo.full_name,
+        created_at=pr.created_at,
+        url=pr.html_url,
+        state=pr.state,
+        review_comments=ReviewComments(
+            total=comment_data["total"],
+            resolved=comment_data["resolved"],
+            unresolved=comment_data["unresolved"]
+        ),
+        reviewers=comment_data["reviewers"],
+        first_comment_date=comment_data["first_comment_date"],
+        last_comment_date=comment_data["last_comment_date"],
+        last_comment_by=comment_data["last_comment_by"]
+    )
+
+
+def group_by_number(comments, url_of) -> Dict[int, list]:
+    """Group repository-level comments by the number at the end of their PR or issue URL"""
+    grouped: Dict[int, list] = {}
+    for comment in comments:
+        number = int(url_of(comment).rsplit("/", 1)[-1])
+        grouped.setdefault(number, []).append(comment)
+    return grouped
+
+
+def organization_token_variable(org: str) -> str:
+    """Environment variable holding the optional token of an organization"""
+    return "GITHUB_TOKEN_" + "".join(c if c.isalnum() else "_" for c in org.upper())
+
 
 class GitHubService:
     def __init__(self):
@@ -22,149 +152,511 @@ class GitHubService:
         if not token:
             raise ValueError("GITHUB_TOKEN environment variable is not set")
         
-        self.github = Github(token)
+        # Retries are handled by the resilience layer instead of PyGithub's own
+        self.github = Github(token, retry=None, per_page=PER_PAGE)
+        self.resilience = ResilientCaller()
         
-    def get_rate_limit_info(self) -> Dict[str, int]:
-        """Get current rate limit status"""
-        rate_limit = self.github.get_rate_limit()
-        return {
+        # One client per organization, orgs without their own token share the default one
+        self.organizations = list(GITHUB_ORGANIZATIONS)
+        self.clients: Dict[str, Github] = {}
+        for org in self.organizations:
+            org_token = os.getenv(organization_token_variable(org))
+            self.clients[org] = Github(org_token, retry=None, per_page=PER_PAGE) if org_token else self.github
+        
+        # Last rate limit read from each client, by id of the client
+        self._rate_limits: Dict[int, Dict[str, Any]] = {}
+        # Epoch time until which an organization is known to be rate limited
+        self._rate_limited_until: Dict[str, float] = {}
+        # Epoch time until which a failed fetch is not retried, by cache key
+        self._retry_at: Dict[str, float] = {}
+        # Epoch time each developer's merged entry expires at
+        self._developer_expiry: Dict[str, float] = {}
+        # Measured GitHub calls of the last refresh, by per-organization cache key
+        self._refresh_costs: Dict[str, float] = {}
+        # Position in the shared invalidation log up to which it was applied
+        self._invalidation_seq = None
+        # Developers the per-repository strategy fetches together
+        self.tracked_developers = list(DEVELOPERS)
+        self._bulk_locks = {org: threading.Lock() for org in self.organizations}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(self.organizations), 1),
+            thread_name_prefix="github-org"
+        )
+        
+    def _client_rate_limit(self, name: str, client: Github) -> Dict[str, Any]:
+        """
+        Rate limit of one client, or its last known value if GitHub cannot be reached
+        
+        Requests served from last good data must not fail on this lookup.
+        """
+        try:
+            rate_limit = self.resilience.call(f"{name}:rate_limit", client.get_rate_limit)
+        except Exception as e:
+            logger.warning(f"Error reading the rate limit of {name}, using the last known value: {e}")
+            known = self._rate_limits.get(id(client))
+            if known is None:
+                known = {"remaining": 0, "limit": 0, "reset_time": self._rate_limited_until.get(name, time.time())}
+            return {**known, "stale": True}
+        
+        info = {
             "remaining": rate_limit.core.remaining,
             "limit": rate_limit.core.limit,
             "reset_time": rate_limit.core.reset.timestamp()
         }
+        self._rate_limits[id(client)] = info
+        return info
+    
+    def get_rate_limit_info(self) -> Dict[str, Any]:
+        """
+        Get current rate limit status
+        
+        The top-level values are those of the most constrained client, the
+        per-organization status is listed under "organizations". Values read
+        while GitHub is unreachable are the last known ones, flagged "stale".
+        """
+        by_client: Dict[int, Dict[str, Any]] = {}
+        organizations = {}
+        for org, client in self.clients.items():
+            if id(client) not in by_client:
+                by_client[id(client)] = self._client_rate_limit(org, client)
+            organizations[org] = {
+                **by_client[id(client)],
+                "rate_limited": self._is_rate_limited(org)
+            }
+        
+        if not by_client:
+            by_client[id(self.github)] = self._client_rate_limit("default", self.github)
+        
+        most_constrained = min(by_client.values(), key=lambda info: info["remaining"])
+        return {
+            **most_constrained,
+            "organizations": organizations
+        }
     
-    def _process_pr_comments(self, pr: GithubPR) -> Dict[str, Any]:
-        """Process PR review comments to get counts and dates"""
-        resolved = 0
-        unresolved = 0
-        reviewers = set()
-        first_comment = None
-        last_comment = None
-        last_comment_by = None
+    def get_last_rate_limit(self) -> Dict[str, Any]:
+        """
+        Rate limit of the most constrained client as of its last response
+        
+        Unlike `get_rate_limit_info` this reads the headers PyGithub kept from
+        earlier calls, so it costs no request once a client has been used.
+        """
+        clients = {id(client): client for client in self.clients.values()} or {id(self.github): self.github}
+        limits = []
+        for client in clients.values():
+            remaining, limit = client.rate_limiting
+            limits.append({
+                "remaining": remaining,
+                "limit": limit,
+                "reset_time": client.rate_limiting_resettime
+            })
+        return min(limits, key=lambda info: info["remaining"])
+    
+    def _is_rate_limited(self, org: str) -> bool:
+        return time.time() < self._rate_limited_until.get(org, 0)
+    
+    def _mark_rate_limited(self, org: str):
+        """Remember that an organization's client hit its rate limit"""
+        reset_time = self.clients[org].rate_limiting_resettime
+        if not reset_time or reset_time <= time.time():
+            reset_time = time.time() + 60
+        self._rate_limited_until[org] = reset_time
+        logger.warning(f"Organization {org} is rate limited until {datetime.fromtimestamp(reset_time)}")
+    
+    def _fetch_pr_comments(self, org: str, pr: GithubPR) -> Tuple[list, list]:
+        """Fetch the review and issue comments of a single PR"""
+        # Fetch failures propagate so incomplete data is never cached as good
+        review_comments = self.resilience.call(f"{org}:comments", lambda: list(pr.get_review_comments()))
+        issue_comments = self.resilience.call(f"{org}:comments", lambda: list(pr.get_issue_comments()))
+        return review_comments, issue_comments
+    
+    def _fetch_org_prs(self, org: str, username: str) -> Tuple[Tuple[CompactPR, ...], str]:
+        """
+        Fetch open PRs of a developer in one organization
+        
+        Tracked developers may be refreshed together through the
+        per-repository strategy, which caches the records of all of them.
+        Failed fetches are never cached: the last good records are served
+        instead until GitHub is retried after STALE_RETRY_SECONDS, and only
+        if there are none the result is empty.
+        
+        Returns:
+            The compact PR records and a status: "ok", "stale", "failed" or "rate_limited"
+        """
+        cache_key = f"prs:{org}:{username}"
+        cached_prs = prs_cache.get(cache_key)
+        if cached_prs is not None:
+            return cached_prs, "ok"
+        
+        if self._is_rate_limited(org):
+            logger.info(f"Skipping {org} for {username}, organization is rate limited")
+            return self._last_good(cache_key, "rate_limited")
+        
+        if time.time() < self._retry_at.get(cache_key, 0):
+            return self._last_good(cache_key, "failed")
+        
+        strategy = fetch_strategy.choose(org) if username in self.tracked_developers else AUTHOR
+        status = "failed"
         
         try:
-            # Get review comments
-            for comment in pr.get_review_comments():
-                reviewers.add(comment.user.login)
-                
-                # Track first and last comment dates
-                if not first_comment or comment.created_at < first_comment:
-                    first_comment = comment.created_at
-                if not last_comment or comment.created_at > last_comment:
-                    last_comment = comment.created_at
-                    last_comment_by = comment.user.login
-                
-                # Check if comment is resolved (simplified logic)
-                # In real implementation, you'd check for reactions, replies, etc.
-                if comment.position is None:  # Outdated comments are marked as resolved
-                    resolved += 1
-                else:
-                    unresolved += 1
-            
-            # Also get issue comments (general PR comments)
-            for comment in pr.get_issue_comments():
-                reviewers.add(comment.user.login)
-                if not first_comment or comment.created_at < first_comment:
-                    first_comment = comment.created_at
-                if not last_comment or comment.created_at > last_comment:
-                    last_comment = comment.created_at
-                    last_comment_by = comment.user.login
+            if strategy == REPOSITORY:
+                with self._bulk_locks[org]:
+                    # Another thread may have refreshed the organization meanwhile
+                    cached_prs = prs_cache.get(cache_key)
+                    if cached_prs is not None:
+                        return cached_prs, "ok"
+                    prs_by_developer, calls = self._fetch_org_prs_by_repository(org)
+            else:
+                prs, calls = self._fetch_org_prs_by_author(org, username)
+                prs_by_developer = {username: prs}
+            status = "ok"
                 
+        except CircuitOpenError as e:
+            logger.warning(f"Not fetching PRs for {username} in {org}: {e}")
+        except GithubException as e:
+            logger.error(f"GitHub API error for user {username} in {org}: {e}")
+            if e.status in (403, 429) and "rate limit" in str(e).lower():
+                self._mark_rate_limited(org)
+                status = "rate_limited"
         except Exception as e:
-            logger.error(f"Error processing comments for PR {pr.number}: {e}")
+            logger.error(f"Error fetching PRs for {username} in {org}: {e}")
         
-        return {
-            "total": resolved + unresolved,
-            "resolved": resolved,
-            "unresolved": unresolved,
-            "reviewers": list(reviewers),
-            "first_comment_date": first_comment,
-            "last_comment_date": last_comment,
-            "last_comment_by": last_comment_by
-        }
+        if status != "ok":
+            # A failed bulk fetch is not retried by every developer in turn
+            failed = self.tracked_developers if strategy == REPOSITORY else [username]
+            for developer in failed:
+                self._retry_at[f"prs:{org}:{developer}"] = time.time() + STALE_RETRY_SECONDS
+            return self._last_good(cache_key, status)
+        
+        fetch_strategy.record(org, strategy, calls, developers=len(prs_by_developer))
+        logger.info(
+            f"Fetched {org} for {len(prs_by_developer)} developer(s) by {strategy} in {calls} calls"
+        )
+        
+        records = ()
+        for developer, developer_prs in prs_by_developer.items():
+            developer_records = self._cache_org_records(
+                org, developer, developer_prs,
+                calls_share=calls / len(prs_by_developer)
+            )
+            if developer == username:
+                records = developer_records
+        return records, status
+    
+    def _fetch_org_prs_by_author(self, org: str, username: str) -> Tuple[List[PullRequest], int]:
+        """
+        Search a developer's open PRs, then load each PR and its comments
+        
+        Returns:
+            The PRs and the number of GitHub calls it took
+        """
+        client = self.clients[org]
+        query = f"is:pr is:open author:{username} org:{org}"
+        logger.info(f"Searching with query: {query}")
+        issues = self.resilience.call(f"{org}:search", lambda: list(client.search_issues(query=query)))
+        calls = pages(len(issues))
+        
+        prs = []
+        for issue in issues:
+            # Get the actual PR object
+            pr = self.resilience.call(f"{org}:pulls", issue.as_pull_request)
+            review_comments, issue_comments = self._fetch_pr_comments(org, pr)
+            calls += 1 + pages(len(review_comments)) + pages(len(issue_comments))
+            prs.append(build_pr_model(pr, summarize_comments(review_comments, issue_comments)))
+        return prs, calls
+    
+    def _fetch_org_prs_by_repository(self, org: str) -> Tuple[Dict[str, List[PullRequest]], int]:
+        """
+        Load the open PRs of every tracked developer in an organization at once
+        
+        Repositories are found with a search for the developers' open PRs.
+        Each repository's open PRs are then listed in bulk, and its review
+        and issue comments are listed once, since the oldest tracked PR was
+        opened, instead of per PR.
+        
+        Returns:
+            The PRs per tracked developer and the number of GitHub calls it took
+        """
+        client = self.clients[org]
+        developers_by_login = {username.lower(): username for username in self.tracked_developers}
+        prs_by_developer: Dict[str, List[PullRequest]] = {username: [] for username in self.tracked_developers}
+        
+        repositories, calls = self._find_repositories(org)
+        for full_name in sorted(repositories):
+            repo = client.get_repo(full_name, lazy=True)
+            pulls = self.resilience.call(f"{org}:pulls", lambda: list(repo.get_pulls(state="open")))
+            calls += pages(len(pulls))
+            
+            tracked_pulls = [pr for pr in pulls if pr.user.login.lower() in developers_by_login]
+            if not tracked_pulls:
+                continue
+            
+            # Comments on a PR are never older than the PR itself
+            since = min(pr.created_at for pr in tracked_pulls)
+            review_comments = self.resilience.call(
+                f"{org}:comments", lambda: list(repo.get_pulls_review_comments(since=since))
+            )
+            issue_comments = self.resilience.call(
+                f"{org}:comments", lambda: list(repo.get_issues_comments(since=since))
+            )
+            calls += pages(len(review_comments)) + pages(len(issue_comments))
+            
+            review_by_number = group_by_number(review_comments, lambda c: c.pull_request_url)
+            issue_by_number = group_by_number(issue_comments, lambda c: c.issue_url)
+            for pr in tracked_pulls:
+                comment_data = summarize_comments(
+                    review_by_number.get(pr.number, []),
+                    issue_by_number.get(pr.number, [])
+                )
+                developer = developers_by_login[pr.user.login.lower()]
+                prs_by_developer[developer].append(build_pr_model(pr, comment_data))
+        
+        return prs_by_developer, calls
+    
+    def _find_repositories(self, org: str) -> Tuple[Set[str], int]:
+        """Repositories with open PRs by tracked developers, and the calls it took"""
+        client = self.clients[org]
+        repositories: Set[str] = set()
+        calls = 0
+        for i in range(0, len(self.tracked_developers), SEARCH_AUTHORS_PER_QUERY):
+            authors = self.tracked_developers[i:i + SEARCH_AUTHORS_PER_QUERY]
+            query = f"is:pr is:open org:{org} " + " ".join(f"author:{author}" for author in authors)
+            issues = self.resilience.call(f"{org}:search", lambda: list(client.search_issues(query=query)))
+            calls += pages(len(issues))
+            # Issue URLs look like .../repos/<owner>/<name>/issues/<number>
+            repositories.update("/".join(issue.url.split("/")[-4:-2]) for issue in issues)
+        return repositories, calls
+    
+    def _cache_org_records(
+        self,
+        org: str,
+        username: str,
+        prs: List[PullRequest],
+        calls_share: float
+    ) -> Tuple[CompactPR, ...]:
+        """Cache a developer's freshly fetched PRs in one organization"""
+        cache_key = f"prs:{org}:{username}"
+        self._retry_at.pop(cache_key, None)
+        self._refresh_costs[cache_key] = calls_share
+        records = compact_prs(prs)
+        tags = developer_tags(username, records)
+        prs_cache.set(cache_key, records, ttl_seconds=refresh_scheduler.ttl_for(username), tags=tags)
+        last_good_cache.set(cache_key, records, ttl_seconds=LAST_GOOD_TTL_SECONDS, tags=tags)
+        return records
+    
+    def _last_good(self, cache_key: str, status: str) -> Tuple[Tuple[CompactPR, ...], str]:
+        """Fall back to the last good records of a cache key after a failure"""
+        last_good = last_good_cache.get(cache_key)
+        if last_good is None:
+            return (), status
+        logger.warning(f"Serving last good data for {cache_key}")
+        return last_good, "stale"
+    
+    def sync_invalidations(self):
+        """
+        Drop cached PRs of developers invalidated by any process since the last check
+        
+        Followers keep snapshots cached until the leader's next refresh, so
+        without this an invalidation would only reach the process receiving it.
+        """
+        if snapshot_store is None:
+            return
+        try:
+            usernames, self._invalidation_seq = snapshot_store.invalidations_since(self._invalidation_seq)
+        except Exception as e:
+            logger.error(f"Error reading invalidations: {e}")
+            return
+        if usernames is None:
+            clear_all()
+        elif usernames:
+            invalidate_tags(*(f"developer:{username}" for username in usernames))
     
     def fetch_developer_prs(self, username: str) -> List[PullRequest]:
-        """Fetch open PRs for a specific developer in the configured organization"""
+        """Fetch open PRs for a specific developer across the configured organizations"""
+        self.sync_invalidations()
+        records, _ = self._fetch_developer_records(username)
+        return expand_prs(records)
+    
+    def _fetch_developer_records(self, username: str) -> Tuple[Tuple[CompactPR, ...], bool]:
+        """
+        Fetch a developer's PRs as compact records, as kept in the cache
+        
+        Returns:
+            The records and whether they are complete and fresh
+        """
         # Check cache first
         cache_key = f"prs:{username}"
-        cached_prs = cache.get(cache_key)
+        cached_prs = prs_cache.get(cache_key)
         if cached_prs is not None:
             logger.info(f"Returning cached PRs for {username}")
-            return cached_prs
+            return cached_prs, True
         
-        prs = []
+        # Followers use the records published by the leader instead of calling GitHub
+        if not leader_elector.is_leader and snapshot_store is not None:
+            snapshot = self._load_snapshot(username)
+            if snapshot is not None:
+                records, refresh_due = snapshot
+                self._apply_records(username, records)
+                # Read again once the leader's next refresh is due
+                ttl_seconds = max(int(refresh_due - time.time()), SNAPSHOT_MIN_TTL_SECONDS)
+                self._cache_developer(username, records, ttl_seconds)
+                return records, True
+            logger.info(f"No snapshot of {username} from the leader yet, fetching from GitHub")
         
-        try:
-            # Search for open PRs authored by the user in the configured organization
-            query = f"is:pr is:open author:{username} org:{GITHUB_ORGANIZATION}"
-            logger.info(f"Searching with query: {query}")
-            issues = self.github.search_issues(query=query)
+        # Organizations are fetched in parallel, a rate limited one does not hold up the others
+        if len(self.organizations) == 1:
+            results = [self._fetch_org_prs(self.organizations[0], username)]
+        else:
+            results = list(self._executor.map(
+                lambda org: self._fetch_org_prs(org, username),
+                self.organizations
+            ))
+        
+        statuses = [status for _, status in results]
+        if statuses and all(status == "rate_limited" for status in statuses):
+            raise Exception("GitHub API rate limit exceeded")
+        
+        records = tuple(record for org_records, _ in results for record in org_records)
+        complete = all(status == "ok" for status in statuses)
+        
+        if complete:
+            # Measured cost, a bulk refresh is shared between its developers
+            refresh_scheduler.record_refresh(
+                username,
+                records_signature(records),
+                api_calls=round(sum(
+                    self._refresh_costs.get(f"prs:{org}:{username}", 1)
+                    for org in self.organizations
+                ))
+            )
+        
+        # A failed or rate limited organization without last good data would
+        # look like closed PRs, so only usable results replace what is known
+        usable = all(status in ("ok", "stale") for status in statuses)
+        if usable:
+            prs = self._apply_records(username, records)
+        if subscription_hub.has_subscribers:
+            try:
+                subscription_hub.publish_rate_limit(self.get_last_rate_limit())
+            except Exception as e:
+                logger.error(f"Error reading rate limit for subscribers: {e}")
+        
+        # Only complete fetches are recorded, partial data would skew trends
+        if complete and history is not None:
+            try:
+                history.record(username, prs)
+            except Exception as e:
+                logger.error(f"Error recording history for {username}: {e}")
+        
+        # Merged results are only cached when every organization was fetched,
+        # per-organization results stay cached on their own keys
+        if complete:
+            ttl_seconds = refresh_scheduler.ttl_for(username)
+            self._cache_developer(username, records, ttl_seconds)
+            logger.info(f"Cached {len(records)} PRs for {username}")
             
-            for issue in issues:
-                # Get the actual PR object
-                pr = issue.as_pull_request()
-                
-                # Process comments
-                comment_data = self._process_pr_comments(pr)
-                
-                # Create PR model
-                pr_model = PullRequest(
-                    id=pr.id,
-                    number=pr.number,
-                    title=pr.title,
-                    repository=pr.base.repo.full_name,
-                    created_at=pr.created_at,
-                    url=pr.html_url,
-                    state=pr.state,
-                    review_comments=ReviewComments(
-                        total=comment_data["total"],
-                        resolved=comment_data["resolved"],
-                        unresolved=comment_data["unresolved"]
-                    ),
-                    reviewers=comment_data["reviewers"],
-                    first_comment_date=comment_data["first_comment_date"],
-                    last_comment_date=comment_data["last_comment_date"],
-                    last_comment_by=comment_data["last_comment_by"]
-                )
-                
-                prs.append(pr_model)
-                
-        except GithubException as e:
-            logger.error(f"GitHub API error for user {username}: {e}")
-            if e.status == 403 and "rate limit" in str(e):
-                raise Exception("GitHub API rate limit exceeded")
-        except Exception as e:
-            logger.error(f"Error fetching PRs for {username}: {e}")
+            # Publish for the other processes
+            if snapshot_store is not None:
+                try:
+                    snapshot_store.save(username, records, ttl_seconds)
+                except Exception as e:
+                    logger.error(f"Error saving snapshot for {username}: {e}")
         
-        # Cache the results for 30 minutes
-        cache.set(cache_key, prs, ttl_seconds=1800)
-        logger.info(f"Cached {len(prs)} PRs for {username}")
+        return records, complete
+    
+    def _apply_records(self, username: str, records: Tuple[CompactPR, ...]) -> List[PullRequest]:
+        """Feed a developer's new records to the change log, indexes and statistics"""
+        # Record the delta for pollers and subscribers
+        changes = change_log.record_refresh(username, records)
+        subscription_hub.publish_changes(username, changes, change_log.epoch)
         
+        # Keep secondary indexes and statistics in sync with the fresh data
+        prs = expand_prs(records)
+        pr_index.update_developer(username, records)
+        review_stats.update_developer(username, prs)
         return prs
     
+    def _cache_developer(self, username: str, records: Tuple[CompactPR, ...], ttl_seconds: int):
+        self._developer_expiry[username] = time.time() + ttl_seconds
+        prs_cache.set(
+            f"prs:{username}", records,
+            ttl_seconds=ttl_seconds,
+            tags=developer_tags(username, records)
+        )
+    
+    def _load_snapshot(self, username: str):
+        try:
+            return snapshot_store.load(username)
+        except Exception as e:
+            logger.error(f"Error loading snapshot for {username}: {e}")
+            return None
+    
+    def drop_invalidated_snapshots(self) -> List[str]:
+        """
+        Drop the cached PRs of developers invalidated through another process
+
+        Run by the leader before a refresh, so those developers are fetched
+        from GitHub again and their snapshots replaced.
+        """
+        if snapshot_store is None:
+            return []
+        usernames = snapshot_store.invalidated()
+        if usernames:
+            invalidate_tags(*(f"developer:{username}" for username in usernames))
+            logger.info(f"Re-fetching developers invalidated elsewhere: {', '.join(usernames)}")
+        return usernames
+    
     def fetch_all_developer_prs(self, developers: List[str]) -> List[DeveloperPRs]:
         """Fetch PRs for all configured developers"""
+        self.sync_invalidations()
         # Generate cache key from developers list
         cache_key = f"all_prs:{','.join(sorted(developers))}"
-        cached_result = cache.get(cache_key)
+        cached_result = all_prs_cache.get(cache_key)
         if cached_result is not None:
             logger.info("Returning cached results for all developers")
-            return cached_result
+            return self._expand_developers(cached_result)
         
-        all_developer_prs = []
+        all_developer_records = []
+        complete = True
         
         for developer in developers:
             logger.info(f"Fetching PRs for {developer}")
-            prs = self.fetch_developer_prs(developer)
-            
-            developer_prs = DeveloperPRs(
-                username=developer,
-                pull_requests=prs
-            )
-            all_developer_prs.append(developer_prs)
+            records, developer_complete = self._fetch_developer_records(developer)
+            all_developer_records.append((developer, records))
+            complete = complete and developer_complete
         
-        # Cache the aggregated results
-        cache.set(cache_key, all_developer_prs, ttl_seconds=1800)
-        logger.info(f"Cached results for {len(developers)} developers")
+        # Rebuild statistics of groups whose developers changed
+        review_stats.flush()
         
-        return all_developer_prs
\ No newline at end of file
+        all_developer_records = tuple(all_developer_records)
+        if not complete:
+            # Don't pin stale or failed data for the full TTL
+            return self._expand_developers(all_developer_records)
+        
+        # Cache the aggregated results, sharing the records of the per-developer entries
+        tags = [
+            tag
+            for username, records in all_developer_records
+            for tag in developer_tags(username, records)
+        ]
+        # Expires with the first of its developers, counting from when each was cached
+        now = time.time()
+        expires_at = min(
+            (
+                self._developer_expiry.get(username) or now + refresh_scheduler.ttl_for(username)
+                for username in developers
+            ),
+            default=now + REFRESH_DEFAULT_TTL_SECONDS
+        )
+        if expires_at > now:
+            all_prs_cache.set(cache_key, all_developer_records, ttl_seconds=expires_at - now, tags=tags)
+            logger.info(f"Cached results for {len(developers)} developers")
+        
+        return self._expand_developers(all_developer_records)
+    
+    @staticmethod
+    def _expand_developers(developer_records) -> List[DeveloperPRs]:
+        """Build response models from cached (username, records) pairs"""
+        return [
+            DeveloperPRs(username=username, pull_requests=expand_prs(records))
+            for username, records in developer_records
+        ]
@@ -0,0 +1,349 @@
+"""Compact append-only history of PR snapshots for trend queries"""
+import asyncio
+import contextlib
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import (
+    HISTORY_PATH, HISTORY_HOURLY_AFTER_DAYS,
+    HISTORY_DAILY_AFTER_DAYS, HISTORY_RETENTION_DAYS
+)
+from app.leader import leader_elector
+
+logger = logging.getLogger(__name__)
+
+# timestamp, developer id, open PRs, unresolved comments, total comments
+RECORD = struct.Struct("<dIIII")
+
+# (timestamp, open PRs, unresolved comments, total comments)
+Sample = Tuple[float, int, int, int]
+
+
+def summarize(prs: Iterable) -> Tuple[int, int, int]:
+    """Reduce a developer's PR list to the values kept in history"""
+    open_prs = unresolved = total = 0
+    for pr in prs:
+        open_prs += 1
+        unresolved += pr.review_comments.unresolved
+        total += pr.review_comments.total
+    return open_prs, unresolved, total
+
+
+class HistoryStore:
+    """
+    Append-only store of per-developer PR snapshots
+
+    Each refresh appends one fixed-size record per developer, and only when
+    the developer's values changed since the previously stored record, so the
+    file holds deltas rather than full copies. Records are read back through
+    a memory map and located by binary search on the timestamp, which keeps
+    range queries fast and memory use proportional to the result.
+
+    Developer names are interned into a small sidecar file (`<path>.devs`)
+    so records only carry a numeric id.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.devs_path = f"{path}.devs"
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._last: Dict[int, Tuple[int, int, int]] = {}
+        self._last_timestamp = 0.0
+        # Index of the first and last record of each developer, for baselines
+        self._positions: Dict[int, List[int]] = {}
+        # (inode, number of records) of the file the positions were read from
+        self._indexed = (0, 0)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        open(self.path, "ab").close()
+        open(self.devs_path, "a").close()
+
+        self._load_developers()
+        self._load_last_values()
+
+    def _load_developers(self):
+        with open(self.devs_path) as f:
+            self._names = [line.rstrip("\n") for line in f if line.strip()]
+        self._ids = {name: i for i, name in enumerate(self._names)}
+
+    def _load_last_values(self):
+        """Rebuild the latest value per developer so deltas survive restarts"""
+        for timestamp, dev_id, *values in self._iter_records(0, None):
+            self._last[dev_id] = tuple(values)
+            self._last_timestamp = max(self._last_timestamp, timestamp)
+
+    def _developer_id(self, username: str) -> int:
+        """Return the id of a developer, registering it if needed"""
+        dev_id = self._ids.get(username)
+        if dev_id is not None:
+            return dev_id
+
+        # Other processes may append to the same table, so re-read under a lock
+        with open(self.devs_path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                self._names = [line.rstrip("\n") for line in f if line.strip()]
+                self._ids = {name: i for i, name in enumerate(self._names)}
+                if username not in self._ids:
+                    f.write(f"{username}\n")
+                    f.flush()
+                    self._ids[username] = len(self._names)
+                    self._names.append(username)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return self._ids[username]
+
+    @contextlib.contextmanager
+    def _locked_file(self):
+        """Open the data file for appending under a lock shared with other processes"""
+        while True:
+            f = open(self.path, "ab")
+            fcntl.flock(f, fcntl.LOCK_EX)
+            # Compaction in another process may have replaced the file while we waited
+            if os.fstat(f.fileno()).st_ino == os.stat(self.path).st_ino:
+                break
+            f.close()
+        try:
+            yield f
+        finally:
+            f.close()
+
+    def _developer_name(self, dev_id: int) -> Optional[str]:
+        if dev_id >= len(self._names):
+            self._load_developers()
+        return self._names[dev_id] if dev_id < len(self._names) else None
+
+    def record(self, username: str, prs: Iterable, timestamp: Optional[float] = None) -> bool:
+        """
+        Append a snapshot of a developer's PRs if it differs from the last one
+
+        Returns:
+            True if a record was written
+        """
+        values = summarize(prs)
+        with self._lock:
+            dev_id = self._developer_id(username)
+            if self._last.get(dev_id) == values:
+                return False
+
+            # Keep the file sorted by time even if the clock goes backwards
+            timestamp = max(timestamp or time.time(), self._last_timestamp)
+            with self._locked_file() as f:
+                f.write(RECORD.pack(timestamp, dev_id, *values))
+
+            self._last[dev_id] = values
+            self._last_timestamp = timestamp
+        return True
+
+    def _iter_records(self, since: float, until: Optional[float]):
+        """Yield raw records with since <= timestamp <= until"""
+        size = os.path.getsize(self.path)
+        count = size // RECORD.size
+        if count == 0:
+            return
+
+        with open(self.path, "rb") as f:
+            with mmap.mmap(f.fileno(), count * RECORD.size, access=mmap.ACCESS_READ) as mm:
+                start = self._bisect(mm, count, since)
+                for i in range(start, count):
+                    record = RECORD.unpack_from(mm, i * RECORD.size)
+                    if until is not None and record[0] > until:
+                        break
+                    yield record
+
+    @staticmethod
+    def _bisect(mm, count: int, timestamp: float) -> int:
+        """Index of the first record with a timestamp >= the given one"""
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if RECORD.unpack_from(mm, mid * RECORD.size)[0] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _index_positions(self, f, mm, count: int):
+        """Update the first and last record of each developer with new records"""
+        inode, indexed = os.fstat(f.fileno()).st_ino, self._indexed[1]
+        if inode != self._indexed[0] or count < indexed:
+            # Compacted since, every record may have moved
+            self._positions = {}
+            indexed = 0
+        for i in range(indexed, count):
+            dev_id = RECORD.unpack_from(mm, i * RECORD.size)[1]
+            positions = self._positions.get(dev_id)
+            if positions is None:
+                self._positions[dev_id] = [i, i]
+            else:
+                positions[1] = i
+        self._indexed = (inode, count)
+
+    def _baseline(self, mm, start: int, dev_ids: Optional[set]) -> Dict[int, tuple]:
+        """
+        Last record before `start` for each requested (or known) developer
+
+        Developers without a record before `start` are skipped and those with
+        no record after it are read directly, so the backward scan only runs
+        until the remaining developers are found.
+        """
+        baseline: Dict[int, tuple] = {}
+        pending = set()
+        for dev_id in (dev_ids if dev_ids is not None else self._positions):
+            positions = self._positions.get(dev_id)
+            if positions is None or positions[0] >= start:
+                continue
+            if positions[1] < start:
+                baseline[dev_id] = RECORD.unpack_from(mm, positions[1] * RECORD.size)
+            else:
+                pending.add(dev_id)
+
+        i = start - 1
+        while pending:
+            record = RECORD.unpack_from(mm, i * RECORD.size)
+            if record[1] in pending:
+                baseline[record[1]] = record
+                pending.discard(record[1])
+            i -= 1
+        return baseline
+
+    def query(
+        self,
+        usernames: Optional[List[str]],
+        since: float,
+        until: Optional[float] = None
+    ) -> Dict[str, List[Sample]]:
+        """
+        Get per-developer series between `since` and `until`
+
+        Because only changes are stored, each series starts with the value
+        that was current at `since` (if any) so it can be drawn as a step line.
+        """
+        dev_ids = None
+        # Developers registered by another process since we last read the table
+        if usernames is None or any(name not in self._ids for name in usernames):
+            self._load_developers()
+        if usernames is not None:
+            dev_ids = {self._ids[name] for name in usernames if name in self._ids}
+            if not dev_ids:
+                return {}
+
+        series: Dict[str, List[Sample]] = {}
+
+        def add(record):
+            name = self._developer_name(record[1])
+            if name is not None:
+                series.setdefault(name, []).append((max(record[0], since), *record[2:]))
+
+        with open(self.path, "rb") as f:
+            # Sized from the open file, compaction may replace the path meanwhile
+            count = os.fstat(f.fileno()).st_size // RECORD.size
+            if count == 0:
+                return series
+            with mmap.mmap(f.fileno(), count * RECORD.size, access=mmap.ACCESS_READ) as mm:
+                start = self._bisect(mm, count, since)
+                with self._lock:
+                    self._index_positions(f, mm, count)
+                    baseline = self._baseline(mm, start, dev_ids)
+                for record in baseline.values():
+                    add(record)
+                for i in range(start, count):
+                    record = RECORD.unpack_from(mm, i * RECORD.size)
+                    if until is not None and record[0] > until:
+                        break
+                    if dev_ids is None or record[1] in dev_ids:
+                        add(record)
+
+        return series
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        Downsample old records and drop expired ones
+
+        Records older than HISTORY_HOURLY_AFTER_DAYS keep only the last value
+        per developer and hour, records older than HISTORY_DAILY_AFTER_DAYS
+        the last value per developer and day. Of the records older than
+        HISTORY_RETENTION_DAYS only the last one per developer is kept, moved
+        to the start of the retention window: as only changes are stored, it
+        is the value of a developer whose numbers have not changed since.
+
+        Returns:
+            Number of records removed
+        """
+        now = now or time.time()
+        hourly_before = now - HISTORY_HOURLY_AFTER_DAYS * 86400
+        daily_before = now - HISTORY_DAILY_AFTER_DAYS * 86400
+        retain_after = now - HISTORY_RETENTION_DAYS * 86400
+
+        # Appends from other processes wait until the compacted file is in place
+        with self._lock, self._locked_file():
+            records = list(self._iter_records(0, None))
+            kept = []
+            # (developer id, bucket) -> index in kept of the last record
+            buckets: Dict[Tuple[int, str, int], int] = {}
+
+            for record in records:
+                timestamp, dev_id = record[0], record[1]
+                if timestamp < retain_after:
+                    bucket = (dev_id, "r", 0)
+                    record = (retain_after, *record[1:])
+                elif timestamp < daily_before:
+                    bucket = (dev_id, "d", int(timestamp // 86400))
+                elif timestamp < hourly_before:
+                    bucket = (dev_id, "h", int(timestamp // 3600))
+                else:
+                    kept.append(record)
+                    continue
+
+                if bucket in buckets:
+                    kept[buckets[bucket]] = None
+                buckets[bucket] = len(kept)
+                kept.append(record)
+
+            kept = [record for record in kept if record is not None]
+            removed = len(records) - len(kept)
+            if removed:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    for record in kept:
+                        f.write(RECORD.pack(*record))
+                os.replace(tmp_path, self.path)
+                logger.info(f"Compacted history: removed {removed} of {len(records)} records")
+
+        return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get history store statistics"""
+        size = os.path.getsize(self.path)
+        return {
+            "records": size // RECORD.size,
+            "developers": len(self._names),
+            "size_bytes": size
+        }
+
+
+# Global history store (disabled when HISTORY_PATH is empty)
+history = HistoryStore(HISTORY_PATH) if HISTORY_PATH else None
+
+
+async def compact_history_periodically():
+    """Downsample the history store periodically, from the leader process only"""
+    while True:
+        if history is not None and leader_elector.is_leader:
+            try:
+                history.compact()
+            except Exception as e:
+                logger.error(f"Error compacting history: {e}")
+        # Sleep for 1 hour
+        await asyncio.sleep(3600)
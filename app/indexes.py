@@ -0,0 +1,138 @@
+"""In-memory secondary indexes over cached PR data"""
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from app.compact import CompactPR, expand_prs
+from app.models import DeveloperPRs
+
+# Width of an age bucket. Buckets are keyed by the creation week of a PR, so
+# they never have to be rebuilt as PRs grow older.
+AGE_BUCKET_DAYS = 7
+
+# key -> username -> pr id -> CompactPR
+IndexEntries = Dict[str, Dict[str, Dict[int, CompactPR]]]
+
+
+def age_bucket(created_ts: float) -> int:
+    """Bucket number for a creation timestamp (days since epoch // bucket width)"""
+    return int(created_ts // 86400) // AGE_BUCKET_DAYS
+
+
+class PRIndex:
+    """
+    Secondary indexes by repository, reviewer login and age bucket
+
+    Indexes hold the same compact records as the cache and are updated
+    incrementally: refreshing one developer only removes and re-adds that
+    developer's PRs. Lookups cost O(result size).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_developer: Dict[str, Sequence[CompactPR]] = {}
+        self._by_repository: IndexEntries = {}
+        self._by_reviewer: IndexEntries = {}
+        self._by_age_bucket: Dict[int, Dict[str, Dict[int, CompactPR]]] = {}
+
+    @staticmethod
+    def _add(index: dict, key, username: str, pr: CompactPR):
+        index.setdefault(key, {}).setdefault(username, {})[pr.id] = pr
+
+    @staticmethod
+    def _remove(index: dict, key, username: str, pr_id: int):
+        developers = index.get(key)
+        if developers is None:
+            return
+        prs = developers.get(username)
+        if prs is not None:
+            prs.pop(pr_id, None)
+            if not prs:
+                del developers[username]
+        if not developers:
+            del index[key]
+
+    @staticmethod
+    def _reviewer_keys(pr: CompactPR) -> Iterable[str]:
+        return {reviewer.lower() for reviewer in pr.reviewers}
+
+    def update_developer(self, username: str, prs: Sequence[CompactPR]):
+        """Replace the indexed PRs of one developer"""
+        with self._lock:
+            for pr in self._by_developer.get(username, []):
+                self._remove(self._by_repository, pr.repository.lower(), username, pr.id)
+                for reviewer in self._reviewer_keys(pr):
+                    self._remove(self._by_reviewer, reviewer, username, pr.id)
+                self._remove(self._by_age_bucket, age_bucket(pr.created_ts), username, pr.id)
+
+            for pr in prs:
+                self._add(self._by_repository, pr.repository.lower(), username, pr)
+                for reviewer in self._reviewer_keys(pr):
+                    self._add(self._by_reviewer, reviewer, username, pr)
+                self._add(self._by_age_bucket, age_bucket(pr.created_ts), username, pr)
+
+            self._by_developer[username] = tuple(prs)
+
+    def remove_developer(self, username: str):
+        """Drop a developer from all indexes"""
+        self.update_developer(username, [])
+        with self._lock:
+            self._by_developer.pop(username, None)
+
+    @staticmethod
+    def _to_developer_prs(entries: Optional[Dict[str, Dict[int, CompactPR]]]) -> List[DeveloperPRs]:
+        if not entries:
+            return []
+        return [
+            DeveloperPRs(username=username, pull_requests=expand_prs(prs.values()))
+            for username, prs in entries.items()
+        ]
+
+    def by_repository(self, full_name: str) -> List[DeveloperPRs]:
+        """Open PRs in a repository (`owner/name`), grouped by author"""
+        with self._lock:
+            return self._to_developer_prs(self._by_repository.get(full_name.lower()))
+
+    def by_reviewer(self, login: str) -> List[DeveloperPRs]:
+        """Open PRs a reviewer has commented on, grouped by author"""
+        with self._lock:
+            return self._to_developer_prs(self._by_reviewer.get(login.lower()))
+
+    def _older_than(self, days: int, now: Optional[datetime]) -> Dict[str, Dict[int, CompactPR]]:
+        cutoff = ((now or datetime.now(timezone.utc)) - timedelta(days=days)).timestamp()
+        cutoff_bucket = age_bucket(cutoff)
+        merged: Dict[str, Dict[int, CompactPR]] = {}
+
+        with self._lock:
+            for bucket, developers in self._by_age_bucket.items():
+                if bucket > cutoff_bucket:
+                    continue
+                for username, prs in developers.items():
+                    for pr_id, pr in prs.items():
+                        # Only the cutoff bucket can hold PRs on both sides
+                        if bucket == cutoff_bucket and pr.created_ts > cutoff:
+                            continue
+                        merged.setdefault(username, {})[pr_id] = pr
+        return merged
+
+    def older_than(self, days: int, now: Optional[datetime] = None) -> List[DeveloperPRs]:
+        """Open PRs created more than `days` days ago, grouped by author"""
+        return self._to_developer_prs(self._older_than(days, now))
+
+    def older_than_ids(self, days: int, now: Optional[datetime] = None) -> Dict[str, Set[int]]:
+        """Ids of the open PRs created more than `days` days ago, by author"""
+        return {username: set(prs) for username, prs in self._older_than(days, now).items()}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get index sizes"""
+        with self._lock:
+            return {
+                "developers": len(self._by_developer),
+                "repositories": len(self._by_repository),
+                "reviewers": len(self._by_reviewer),
+                "age_buckets": len(self._by_age_bucket),
+            }
+
+
+# Global index instance
+pr_index = PRIndex()
@@ -0,0 +1,319 @@
+"""Leader election and shared state between workers and instances"""
+import asyncio
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.compact import CompactPR
+from app.config import LEADER_DB_PATH, LEADER_LEASE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "refresher"
+# Invalidations kept for processes catching up, older ones clear everything
+INVALIDATION_LOG_ENTRIES = 1000
+# Stands for every developer in the invalidation log
+ALL_DEVELOPERS = "*"
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open the coordination database, creating it if needed"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=10, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript("""
+        CREATE TABLE IF NOT EXISTS leases (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            host TEXT NOT NULL,
+            pid INTEGER NOT NULL,
+            acquired_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS snapshots (
+            username TEXT PRIMARY KEY,
+            records BLOB NOT NULL,
+            refreshed_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS invalidations (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS changelog (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            epoch TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            evicted_through INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            version INTEGER NOT NULL,
+            username TEXT NOT NULL,
+            change TEXT NOT NULL,
+            pr_id INTEGER NOT NULL,
+            record BLOB
+        );
+        CREATE INDEX IF NOT EXISTS changes_by_version ON changes (version);
+        CREATE TABLE IF NOT EXISTS change_states (
+            username TEXT PRIMARY KEY,
+            records BLOB NOT NULL,
+            version INTEGER NOT NULL
+        );
+    """)
+    return connection
+
+
+class LeaderElector:
+    """
+    Elects one process to run background work through a lease row in SQLite
+
+    Every process tries to take or renew the lease every third of
+    `lease_seconds`. The holder renews it for as long as it runs; if it dies,
+    the lease expires and the next process to try becomes leader. Without a
+    database path every process is its own leader.
+    """
+
+    def __init__(self, path: Optional[str], lease_seconds: float = LEADER_LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.host = socket.gethostname()
+        self.pid = 0
+        self._identity = ""
+        self._is_leader = not path
+        self._lease_expires = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def identity(self) -> str:
+        # Regenerated after a fork, so preloaded gunicorn workers do not share one
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self._identity = f"{self.host}:{self.pid}:{uuid.uuid4().hex[:8]}"
+            self._is_leader = not self.path
+        return self._identity
+
+    @property
+    def is_leader(self) -> bool:
+        # A leader that could not renew in time steps down on its own
+        if not self.enabled:
+            return True
+        return self._is_leader and self.pid == os.getpid() and time.time() < self._lease_expires
+
+    def renew(self, now: Optional[float] = None) -> bool:
+        """Take the lease if it is free or expired, or extend our own"""
+        if not self.enabled:
+            return True
+        now = now or time.time()
+        identity = self.identity
+        connection = connect(self.path)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                """
+                INSERT INTO leases (name, holder, host, pid, acquired_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET
+                    acquired_at = CASE WHEN leases.holder = excluded.holder
+                        THEN leases.acquired_at ELSE excluded.acquired_at END,
+                    holder = excluded.holder,
+                    host = excluded.host,
+                    pid = excluded.pid,
+                    expires_at = excluded.expires_at
+                WHERE leases.holder = excluded.holder OR leases.expires_at <= excluded.acquired_at
+                """,
+                (LEASE_NAME, identity, self.host, self.pid, now, now + self.lease_seconds)
+            )
+            holder = connection.execute(
+                "SELECT holder FROM leases WHERE name = ?", (LEASE_NAME,)
+            ).fetchone()[0]
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+        was_leader = self.is_leader
+        self._is_leader = holder == identity
+        if self._is_leader:
+            self._lease_expires = now + self.lease_seconds
+        if self._is_leader and not was_leader:
+            logger.info(f"Became leader as {identity}")
+        elif was_leader and not self._is_leader:
+            logger.warning(f"Lost leadership to {holder}")
+        return self.is_leader
+
+    def release(self):
+        """Give up the lease so another process takes over without waiting"""
+        if not self.is_leader or not self.enabled:
+            return
+        self._is_leader = False
+        connection = connect(self.path)
+        try:
+            connection.execute(
+                "DELETE FROM leases WHERE name = ? AND holder = ?",
+                (LEASE_NAME, self._identity)
+            )
+        finally:
+            connection.close()
+
+    def current_leader(self) -> Optional[Dict[str, Any]]:
+        """The current lease holder, or None if there is no live lease"""
+        if not self.enabled:
+            return {"holder": self.identity, "host": self.host, "pid": self.pid}
+        connection = connect(self.path)
+        try:
+            row = connection.execute(
+                "SELECT holder, host, pid, acquired_at, expires_at FROM leases WHERE name = ?",
+                (LEASE_NAME,)
+            ).fetchone()
+        finally:
+            connection.close()
+        if row is None or row[4] <= time.time():
+            return None
+        holder, host, pid, acquired_at, expires_at = row
+        return {
+            "holder": holder,
+            "host": host,
+            "pid": pid,
+            "acquired_at": acquired_at,
+            "expires_at": expires_at
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "identity": self.identity,
+            "is_leader": self.is_leader,
+            "leader": self.current_leader()
+        }
+
+
+class SnapshotStore:
+    """
+    Per-developer PR records published by the leader for the other processes
+
+    Followers read a developer's records from here instead of fetching them
+    from GitHub, and keep them until the leader's next refresh is due. An
+    invalidated snapshot is marked as due (expires_at = 0) so the leader
+    fetches it again, and the invalidation is logged so every process drops
+    its cached copy.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def save(self, username: str, records: Sequence[CompactPR], ttl_seconds: float):
+        now = time.time()
+        connection = connect(self.path)
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO snapshots (username, records, refreshed_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (username, pickle.dumps(tuple(records)), now, now + ttl_seconds)
+            )
+        finally:
+            connection.close()
+
+    def load(self, username: str) -> Optional[Tuple[Tuple[CompactPR, ...], float]]:
+        """
+        Returns:
+            The records and the time the leader will refresh them, or None
+        """
+        connection = connect(self.path)
+        try:
+            row = connection.execute(
+                "SELECT records, expires_at FROM snapshots WHERE username = ?", (username,)
+            ).fetchone()
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def invalidate(self, usernames: Sequence[str]) -> int:
+        """Mark developers' snapshots as due and log the invalidation, returns how many were marked"""
+        connection = connect(self.path)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            if ALL_DEVELOPERS in usernames:
+                marked = connection.execute("UPDATE snapshots SET expires_at = 0").rowcount
+            else:
+                marked = connection.executemany(
+                    "UPDATE snapshots SET expires_at = 0 WHERE username = ?",
+                    [(username,) for username in usernames]
+                ).rowcount
+            cursor = connection.executemany(
+                "INSERT INTO invalidations (username) VALUES (?)",
+                [(username,) for username in usernames]
+            )
+            connection.execute(
+                "DELETE FROM invalidations WHERE seq <= (SELECT MAX(seq) FROM invalidations) - ?",
+                (INVALIDATION_LOG_ENTRIES,)
+            )
+            connection.execute("COMMIT")
+            return marked
+        finally:
+            connection.close()
+
+    def invalidations_since(self, seq: Optional[int]) -> Tuple[Optional[List[str]], int]:
+        """
+        Developers invalidated by any process after position `seq` of the log
+
+        Returns:
+            The developers, or None if every developer must be considered
+            invalidated (ALL_DEVELOPERS, or `seq` fell out of the log), and
+            the position to ask from next time. Without a position only the
+            current one is returned.
+        """
+        connection = connect(self.path)
+        try:
+            oldest, latest = connection.execute(
+                "SELECT MIN(seq), MAX(seq) FROM invalidations"
+            ).fetchone()
+            if seq is None or latest is None or latest <= seq:
+                return [], latest if latest is not None else seq or 0
+            rows = connection.execute(
+                "SELECT username FROM invalidations WHERE seq > ? AND seq <= ?", (seq, latest)
+            ).fetchall()
+        finally:
+            connection.close()
+        usernames = list(dict.fromkeys(row[0] for row in rows))
+        if seq < oldest - 1 or ALL_DEVELOPERS in usernames:
+            return None, latest
+        return usernames, latest
+
+    def invalidated(self) -> List[str]:
+        """Developers whose snapshots were invalidated since the leader last saved them"""
+        connection = connect(self.path)
+        try:
+            rows = connection.execute(
+                "SELECT username FROM snapshots WHERE expires_at = 0"
+            ).fetchall()
+        finally:
+            connection.close()
+        return [row[0] for row in rows]
+
+
+async def maintain_leadership(elector: "LeaderElector"):
+    """Renew or take over the lease periodically"""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, elector.renew)
+        except Exception as e:
+            logger.error(f"Error renewing leader lease: {e}")
+        await asyncio.sleep(elector.lease_seconds / 3)
+
+
+# Global leader elector and snapshot store instances
+leader_elector = LeaderElector(LEADER_DB_PATH)
+snapshot_store = SnapshotStore(LEADER_DB_PATH) if LEADER_DB_PATH else None
@@ -1,20 +1,47 @@
 """Main FastAPI application"""
 import os
+import json
 import asyncio
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from fastapi import (
+    FastAPI, HTTPException, Depends, Query, Request, Response,
+    WebSocket, WebSocketDisconnect, status
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 import logging
 from dotenv import load_dotenv
 
-from app.models import PRResponse, DeveloperPRs
+from app.models import (
+    PRResponse, DeveloperPRs, HistoryPoint, HistoryResponse, GroupStats,
+    PRChange, PRChangesResponse
+)
 from app.github_service import GitHubService
-from app.config import DEVELOPERS, DEVELOPER_GROUPS, ALLOWED_ORIGINS
+from app.config import (
+    DEVELOPERS, DEVELOPER_GROUPS, ALLOWED_ORIGINS, REFRESH_CHECK_SECONDS
+)
 from app.auth import (
     AuthResponse, UserInfo, 
-    get_current_user, create_access_token
+    get_current_user, create_access_token, decode_token
+)
+from app.cache import (
+    get_cache, get_namespaces, get_all_stats, clear_all, invalidate_tags,
+    cleanup_cache_periodically
+)
+from app.indexes import pr_index
+from app.aggregates import review_stats
+from app.refresh import refresh_scheduler
+from app.changes import change_log
+from app.subscriptions import subscription_hub, encode
+from app.leader import ALL_DEVELOPERS, leader_elector, maintain_leadership, snapshot_store
+from app.strategy import fetch_strategy
+from app.history import history, compact_history_periodically
+from app.query import (
+    PRQuery, QueryError, MAX_PAGE_SIZE,
+    filter_developer_prs, paginate, parse_fields, projection
 )
-from app.cache import cache, cleanup_cache_periodically
 
 # Load environment variables
 load_dotenv()
@@ -67,19 +94,61 @@ async def startup_event():
         github_service = GitHubService()
         logger.info("GitHub service initialized successfully")
         
+        # Take part in leader election, only the leader crawls GitHub in the background
+        leader_elector.renew()
+        asyncio.create_task(maintain_leadership(leader_elector))
+        logger.info(f"Leader election started, leader: {leader_elector.is_leader}")
+        
         # Start periodic cache cleanup task
         asyncio.create_task(cleanup_cache_periodically())
         logger.info("Cache cleanup task started")
         
+        # Start periodic history downsampling task
+        asyncio.create_task(compact_history_periodically())
+        logger.info("History compaction task started")
+        
+        # Start the background refresh of expired developers
+        asyncio.create_task(refresh_periodically())
+        logger.info("Background refresh task started")
+        
     except Exception as e:
         logger.error(f"Failed to initialize GitHub service: {e}")
         raise
 
 
+async def refresh_periodically():
+    """
+    Refresh expired developers in the background
+    
+    The leader refreshes every developer, which publishes their snapshots for
+    the other processes. Followers only pick up new snapshots for developers
+    with WebSocket subscribers, so those changes are pushed without polling.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(REFRESH_CHECK_SECONDS)
+        subscribed = subscription_hub.subscribed_developers()
+        developers = DEVELOPERS if leader_elector.is_leader else subscribed
+        if not developers or not github_service:
+            continue
+        try:
+            # Only developers whose cached PRs expired are fetched again
+            refresh_scheduler.record_access(subscribed)
+            if leader_elector.is_leader:
+                await loop.run_in_executor(None, github_service.drop_invalidated_snapshots)
+            await loop.run_in_executor(None, github_service.fetch_all_developer_prs, developers)
+        except Exception as e:
+            logger.error(f"Error refreshing developers in the background: {e}")
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
-    pass
+    # Let another process take over background work right away
+    try:
+        leader_elector.release()
+    except Exception as e:
+        logger.error(f"Error releasing leader lease: {e}")
 
 
 @app.get("/")
@@ -153,11 +222,85 @@ async def logout():
     return {"message": "Logged out successfully"}
 
 
+def pr_query_params(
+    repo: Optional[str] = Query(None, description="Repository name or owner/name"),
+    reviewer: Optional[str] = Query(None, description="Login of a reviewer who commented"),
+    min_unresolved: Optional[int] = Query(None, ge=0, description="Minimum unresolved comments"),
+    older_than: Optional[int] = Query(None, ge=0, description="Minimum PR age in days"),
+) -> PRQuery:
+    """Collect PR filter query parameters"""
+    return PRQuery(
+        repo=repo,
+        reviewer=reviewer,
+        min_unresolved=min_unresolved,
+        older_than=older_than
+    )
+
+
+def build_pr_response(
+    developer_prs: List[DeveloperPRs],
+    rate_limit_remaining: int,
+    position: Tuple[int, str],
+    query: PRQuery,
+    fields: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Filter, paginate and project cached PR data into a response
+
+    `position` is the change log version and epoch read before the data
+    was loaded, so a change recorded meanwhile is sent again by the next
+    poll rather than skipped.
+
+    Returns a PRResponse, or a JSONResponse with only the requested PR
+    fields when a projection is asked for.
+    """
+    try:
+        selected_fields = parse_fields(fields)
+        # The age filter is answered from the age buckets of the PR index
+        aged = pr_index.older_than_ids(query.older_than) if query.older_than is not None else None
+        developer_prs = filter_developer_prs(developer_prs, query, aged)
+        next_cursor = None
+        if limit is not None or cursor is not None:
+            developer_prs, next_cursor = paginate(developer_prs, limit or MAX_PAGE_SIZE, cursor)
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = PRResponse(
+        developers=developer_prs,
+        fetched_at=datetime.now(),
+        rate_limit_remaining=rate_limit_remaining,
+        next_cursor=next_cursor,
+        version=position[0],
+        epoch=position[1]
+    )
+
+    if selected_fields is None:
+        return response
+
+    return JSONResponse(
+        content=response.model_dump(mode="json", include=projection(selected_fields))
+    )
+
+
 @app.get("/api/pull-requests", response_model=PRResponse)
-async def get_pull_requests(current_user: UserInfo = Depends(get_current_user)):
+async def get_pull_requests(
+    query: PRQuery = Depends(pr_query_params),
+    fields: Optional[str] = Query(None, description="Comma-separated PR fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size in PRs"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    current_user: UserInfo = Depends(get_current_user)
+):
     """
     Fetch open pull requests for all configured developers
     
+    Args:
+        query: Optional filters by repository, reviewer, unresolved comments and age
+        fields: Optional projection of PR fields
+        limit: Optional page size for cursor pagination
+        cursor: Cursor returned as `next_cursor` by the previous page
+        
     Returns:
         PRResponse: List of developers with their open PRs
     """
@@ -171,21 +314,29 @@ async def get_pull_requests(current_user: UserInfo = Depends(get_current_user)):
         logger.info("Fetching PRs for all developers")
         
         # Fetch PRs for all developers
-        developer_prs = github_service.fetch_all_developer_prs(DEVELOPERS)
+        refresh_scheduler.record_access(DEVELOPERS)
+        position = await run_in_threadpool(change_log.position)
+        developer_prs = await run_in_threadpool(github_service.fetch_all_developer_prs, DEVELOPERS)
         
         # Get rate limit info
-        rate_limit_info = github_service.get_rate_limit_info()
-        
-        response = PRResponse(
-            developers=developer_prs,
-            fetched_at=datetime.now(),
-            rate_limit_remaining=rate_limit_info["remaining"]
+        rate_limit_info = await run_in_threadpool(github_service.get_rate_limit_info)
+        
+        response = build_pr_response(
+            developer_prs,
+            rate_limit_info["remaining"],
+            position,
+            query,
+            fields=fields,
+            limit=limit,
+            cursor=cursor
         )
         
         logger.info(f"Successfully fetched PRs. Rate limit remaining: {rate_limit_info['remaining']}")
         
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching pull requests: {e}")
         
@@ -201,6 +352,153 @@ async def get_pull_requests(current_user: UserInfo = Depends(get_current_user)):
         )
 
 
+@app.get("/api/pull-requests/changes", response_model=PRChangesResponse)
+async def get_pull_request_changes(
+    since: int = Query(..., ge=0, description="Last version the client has seen (0 for none)"),
+    epoch: Optional[str] = Query(None, description="Epoch returned with that version"),
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Get PRs added, changed or removed since a version
+    
+    Clients start with a full `/api/pull-requests` load, then poll with the
+    `version` and `epoch` returned by it and by each poll. When
+    `resync_required` is true the changes are not available (too old, or from
+    a server not sharing LEADER_DB_PATH) and the client must reload everything.
+    
+    Args:
+        since: Last version the client has seen
+        epoch: Epoch the version belongs to
+        
+    Returns:
+        PRChangesResponse: Changes since the version, latest state per PR
+    """
+    try:
+        if not github_service:
+            raise HTTPException(
+                status_code=500,
+                detail="GitHub service not initialized"
+            )
+        
+        # Refreshes expired developers, which records their changes
+        refresh_scheduler.record_access(DEVELOPERS)
+        await run_in_threadpool(github_service.fetch_all_developer_prs, DEVELOPERS)
+        
+        changes = change_log.since(since, epoch)
+        if changes is None:
+            return PRChangesResponse(
+                epoch=change_log.epoch,
+                version=change_log.version,
+                resync_required=True,
+                changes=[]
+            )
+        
+        # The version the changes reach, later ones may be recorded meanwhile
+        return PRChangesResponse(
+            epoch=change_log.epoch,
+            version=changes[-1].version if changes else since,
+            resync_required=False,
+            changes=[
+                PRChange(
+                    username=change.username,
+                    change=change.change,
+                    pr_id=change.pr_id,
+                    pull_request=change.record.to_model() if change.record else None
+                )
+                for change in changes
+            ]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching pull request changes: {e}")
+        
+        if "rate limit" in str(e).lower():
+            raise HTTPException(
+                status_code=429,
+                detail="GitHub API rate limit exceeded. Please try again later."
+            )
+        
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch pull request changes: {str(e)}"
+        )
+
+
+def resolve_subscription(message: dict) -> List[str]:
+    """Developers named by the groups and developers of a subscription message"""
+    groups = message.get("groups") or []
+    developers = message.get("developers") or []
+    if not isinstance(groups, list) or not isinstance(developers, list):
+        raise ValueError("groups and developers must be lists")
+    
+    unknown_groups = [group for group in groups if group not in DEVELOPER_GROUPS]
+    if unknown_groups:
+        raise ValueError(f"Unknown groups: {', '.join(map(str, unknown_groups))}")
+    unknown_developers = [developer for developer in developers if developer not in DEVELOPERS]
+    if unknown_developers:
+        raise ValueError(f"Unknown developers: {', '.join(map(str, unknown_developers))}")
+    
+    resolved = list(developers)
+    for group in groups:
+        resolved.extend(DEVELOPER_GROUPS[group])
+    return list(dict.fromkeys(resolved))
+
+
+@app.websocket("/ws/pull-requests")
+async def pull_request_updates(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """
+    Push PR changes and rate limit updates for subscribed groups or developers
+    
+    Browsers cannot set headers on WebSocket requests, so the JWT is passed as
+    the `token` query parameter. Clients send
+    `{"action": "subscribe" | "unsubscribe", "groups": [...], "developers": [...]}`
+    and receive `changes`, `rate_limit` and `resync` messages. Changes carry
+    the `version` and `epoch` of `/api/pull-requests/changes`, so a client
+    told to resync reloads over HTTP and continues from there.
+    """
+    try:
+        decode_token(token or "")
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    subscriber = subscription_hub.connect()
+    sender = asyncio.create_task(subscription_hub.pump(subscriber, websocket.send_text))
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = json.loads(text)
+                if not isinstance(message, dict):
+                    raise ValueError("Message must be a JSON object")
+                action = message.get("action")
+                if action not in ("subscribe", "unsubscribe"):
+                    raise ValueError(f"Unknown action: {action}")
+                developers = resolve_subscription(message)
+            except ValueError as e:
+                subscriber.offer(encode({"type": "error", "detail": str(e)}))
+                continue
+            
+            if action == "subscribe":
+                subscription_hub.subscribe(subscriber, developers)
+            else:
+                subscription_hub.unsubscribe(subscriber, developers)
+            subscriber.offer(encode({
+                "type": "subscribed",
+                "developers": sorted(subscriber.developers),
+                "epoch": change_log.epoch,
+                "version": change_log.version
+            }))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        subscription_hub.disconnect(subscriber)
+
+
 @app.get("/api/developers")
 async def get_developers(current_user: UserInfo = Depends(get_current_user)):
     """Get list of configured developers"""
@@ -222,6 +520,10 @@ async def get_groups(current_user: UserInfo = Depends(get_current_user)):
 @app.get("/api/groups/{group_name}/pull-requests", response_model=PRResponse)
 async def get_group_pull_requests(
     group_name: str,
+    query: PRQuery = Depends(pr_query_params),
+    fields: Optional[str] = Query(None, description="Comma-separated PR fields to return"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size in PRs"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
     current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -229,6 +531,10 @@ async def get_group_pull_requests(
     
     Args:
         group_name: Name of the developer group
+        query: Optional filters by repository, reviewer, unresolved comments and age
+        fields: Optional projection of PR fields
+        limit: Optional page size for cursor pagination
+        cursor: Cursor returned as `next_cursor` by the previous page
         
     Returns:
         PRResponse: List of developers in the group with their open PRs
@@ -253,15 +559,21 @@ async def get_group_pull_requests(
         logger.info(f"Fetching PRs for group '{group_name}' with {len(group_developers)} developers")
         
         # Fetch PRs for group developers
-        developer_prs = github_service.fetch_all_developer_prs(group_developers)
+        refresh_scheduler.record_access(group_developers)
+        position = await run_in_threadpool(change_log.position)
+        developer_prs = await run_in_threadpool(github_service.fetch_all_developer_prs, group_developers)
         
         # Get rate limit info
-        rate_limit_info = github_service.get_rate_limit_info()
-        
-        response = PRResponse(
-            developers=developer_prs,
-            fetched_at=datetime.now(),
-            rate_limit_remaining=rate_limit_info["remaining"]
+        rate_limit_info = await run_in_threadpool(github_service.get_rate_limit_info)
+        
+        response = build_pr_response(
+            developer_prs,
+            rate_limit_info["remaining"],
+            position,
+            query,
+            fields=fields,
+            limit=limit,
+            cursor=cursor
         )
         
         logger.info(f"Successfully fetched PRs for group '{group_name}'. Rate limit remaining: {rate_limit_info['remaining']}")
@@ -285,6 +597,65 @@ async def get_group_pull_requests(
         )
 
 
+@app.get("/api/groups/{group_name}/stats", response_model=GroupStats)
+async def get_group_stats(
+    group_name: str,
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Get precomputed review-health statistics for a group
+    
+    Args:
+        group_name: Name of the developer group
+        
+    Returns:
+        GroupStats: PR age, time to first comment, time since last comment,
+        unresolved backlog and stale PRs for the group and each developer
+    """
+    try:
+        if not github_service:
+            raise HTTPException(
+                status_code=500,
+                detail="GitHub service not initialized"
+            )
+        
+        if group_name not in DEVELOPER_GROUPS:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Group '{group_name}' not found"
+            )
+        
+        stats = review_stats.get_group_stats(group_name)
+        if stats is None:
+            # Statistics are built on refresh, warm the group once
+            await run_in_threadpool(github_service.fetch_all_developer_prs, DEVELOPER_GROUPS[group_name])
+            stats = review_stats.get_group_stats(group_name)
+        
+        if stats is None:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Statistics for group '{group_name}' are not available yet"
+            )
+        
+        return stats
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching stats for group '{group_name}': {e}")
+        
+        if "rate limit" in str(e).lower():
+            raise HTTPException(
+                status_code=429,
+                detail="GitHub API rate limit exceeded. Please try again later."
+            )
+        
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch group stats: {str(e)}"
+        )
+
+
 @app.get("/api/developers/{username}/pull-requests")
 async def get_developer_pull_requests(
     username: str,
@@ -309,7 +680,8 @@ async def get_developer_pull_requests(
         logger.info(f"Fetching PRs for developer '{username}'")
         
         # Fetch PRs for the developer
-        prs = github_service.fetch_developer_prs(username)
+        refresh_scheduler.record_access([username])
+        prs = await run_in_threadpool(github_service.fetch_developer_prs, username)
         
         developer_prs = DeveloperPRs(
             username=username,
@@ -335,6 +707,174 @@ async def get_developer_pull_requests(
         )
 
 
+@app.get("/api/repositories/{owner}/{repo}/pull-requests", response_model=PRResponse)
+async def get_repository_pull_requests(
+    owner: str,
+    repo: str,
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Fetch open pull requests in a repository, answered from the repository index
+    
+    Args:
+        owner: Repository owner (organization)
+        repo: Repository name
+        
+    Returns:
+        PRResponse: Authors with their open PRs in the repository
+    """
+    try:
+        if not github_service:
+            raise HTTPException(
+                status_code=500,
+                detail="GitHub service not initialized"
+            )
+        
+        # Make sure the index is populated (served from cache when warm)
+        await run_in_threadpool(github_service.fetch_all_developer_prs, DEVELOPERS)
+        
+        developer_prs = pr_index.by_repository(f"{owner}/{repo}")
+        rate_limit_info = await run_in_threadpool(github_service.get_rate_limit_info)
+        
+        return PRResponse(
+            developers=developer_prs,
+            fetched_at=datetime.now(),
+            rate_limit_remaining=rate_limit_info["remaining"]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching pull requests for repository '{owner}/{repo}': {e}")
+        
+        if "rate limit" in str(e).lower():
+            raise HTTPException(
+                status_code=429,
+                detail="GitHub API rate limit exceeded. Please try again later."
+            )
+        
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch pull requests: {str(e)}"
+        )
+
+
+@app.get("/api/reviewers/{login}/pull-requests", response_model=PRResponse)
+async def get_reviewer_pull_requests(
+    login: str,
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Fetch open pull requests a reviewer has commented on, answered from the reviewer index
+    
+    Args:
+        login: GitHub login of the reviewer
+        
+    Returns:
+        PRResponse: Authors with the open PRs the reviewer commented on
+    """
+    try:
+        if not github_service:
+            raise HTTPException(
+                status_code=500,
+                detail="GitHub service not initialized"
+            )
+        
+        # Make sure the index is populated (served from cache when warm)
+        await run_in_threadpool(github_service.fetch_all_developer_prs, DEVELOPERS)
+        
+        developer_prs = pr_index.by_reviewer(login)
+        rate_limit_info = await run_in_threadpool(github_service.get_rate_limit_info)
+        
+        return PRResponse(
+            developers=developer_prs,
+            fetched_at=datetime.now(),
+            rate_limit_remaining=rate_limit_info["remaining"]
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching pull requests for reviewer '{login}': {e}")
+        
+        if "rate limit" in str(e).lower():
+            raise HTTPException(
+                status_code=429,
+                detail="GitHub API rate limit exceeded. Please try again later."
+            )
+        
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch pull requests: {str(e)}"
+        )
+
+
+@app.get("/api/history", response_model=HistoryResponse)
+async def get_history(
+    developer: Optional[str] = Query(None, description="Only this developer"),
+    group: Optional[str] = Query(None, description="Only developers of this group"),
+    since: Optional[datetime] = Query(None, description="Start of range (default: 7 days ago)"),
+    until: Optional[datetime] = Query(None, description="End of range (default: now)"),
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Get open PR and comment backlog history per developer
+    
+    Args:
+        developer: Optional developer to restrict the series to
+        group: Optional group to restrict the series to
+        since: Start of the time range
+        until: End of the time range
+        
+    Returns:
+        HistoryResponse: Step series of snapshots per developer
+    """
+    if history is None:
+        raise HTTPException(
+            status_code=404,
+            detail="History store is disabled"
+        )
+    
+    if group is not None and group not in DEVELOPER_GROUPS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Group '{group}' not found"
+        )
+    
+    until = until or datetime.now(since.tzinfo if since else None)
+    since = since or until - timedelta(days=7)
+    if since.timestamp() > until.timestamp():
+        raise HTTPException(
+            status_code=400,
+            detail="'since' must be before 'until'"
+        )
+    
+    usernames = None
+    if group is not None:
+        usernames = list(DEVELOPER_GROUPS[group])
+    if developer is not None:
+        usernames = [developer] if usernames is None or developer in usernames else []
+    
+    series = history.query(usernames, since.timestamp(), until.timestamp())
+    
+    return HistoryResponse(
+        since=since,
+        until=until,
+        series={
+            username: [
+                HistoryPoint(
+                    timestamp=datetime.fromtimestamp(timestamp, tz=since.tzinfo),
+                    open_prs=open_prs,
+                    unresolved_comments=unresolved,
+                    total_comments=total
+                )
+                for timestamp, open_prs, unresolved, total in samples
+            ]
+            for username, samples in series.items()
+        }
+    )
+
+
 @app.get("/api/rate-limit")
 async def get_rate_limit(current_user: UserInfo = Depends(get_current_user)):
     """Get current GitHub API rate limit status"""
@@ -345,8 +885,12 @@ async def get_rate_limit(current_user: UserInfo = Depends(get_current_user)):
                 detail="GitHub service not initialized"
             )
         
-        rate_limit_info = github_service.get_rate_limit_info()
-        return rate_limit_info
+        rate_limit_info = await run_in_threadpool(github_service.get_rate_limit_info)
+        return {
+            **rate_limit_info,
+            "circuits": github_service.resilience.get_stats(),
+            "fetch_strategy": fetch_strategy.get_stats()
+        }
         
     except Exception as e:
         logger.error(f"Error fetching rate limit: {e}")
@@ -358,12 +902,109 @@ async def get_rate_limit(current_user: UserInfo = Depends(get_current_user)):
 
 @app.get("/api/cache/stats")
 async def get_cache_stats(current_user: UserInfo = Depends(get_current_user)):
-    """Get cache statistics"""
-    return cache.get_stats()
+    """Get cache statistics per namespace, the refresh schedule, subscriptions and the current leader"""
+    return {
+        **get_all_stats(),
+        "refresh": refresh_scheduler.get_stats(),
+        "subscriptions": subscription_hub.get_stats(),
+        "leader": leader_elector.get_stats()
+    }
+
+
+async def broadcast_invalidation(usernames: List[str]) -> int:
+    """
+    Have the leader re-fetch developers and the other processes drop their copies
+    
+    Returns:
+        Number of snapshots marked as due
+    """
+    if snapshot_store is None or not usernames:
+        return 0
+    try:
+        snapshots = await run_in_threadpool(snapshot_store.invalidate, usernames)
+        if github_service:
+            # Our own entries are already dropped, only catch up with the log
+            await run_in_threadpool(github_service.sync_invalidations)
+        return snapshots
+    except Exception as e:
+        logger.error(f"Error invalidating snapshots: {e}")
+        return 0
 
 
 @app.post("/api/cache/clear")
-async def clear_cache(current_user: UserInfo = Depends(get_current_user)):
-    """Clear all cache entries"""
-    cache.clear()
-    return {"message": "Cache cleared successfully"}
\ No newline at end of file
+async def clear_cache(
+    namespace: Optional[str] = Query(None, description="Only clear this namespace"),
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """Clear all cache entries, or those of one namespace"""
+    if namespace is None:
+        clear_all()
+        await broadcast_invalidation([ALL_DEVELOPERS])
+        return {"message": "Cache cleared successfully"}
+    
+    if namespace not in get_namespaces():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Cache namespace '{namespace}' not found"
+        )
+    
+    get_cache(namespace).clear()
+    return {"message": f"Cache namespace '{namespace}' cleared successfully"}
+
+
+@app.post("/api/cache/invalidate")
+async def invalidate_cache(
+    developer: Optional[str] = Query(None, description="Invalidate a developer's PRs"),
+    group: Optional[str] = Query(None, description="Invalidate the PRs of a group's developers"),
+    repository: Optional[str] = Query(None, description="Invalidate PRs in a repository (owner/name)"),
+    namespace: Optional[str] = Query(None, description="Only invalidate in this namespace"),
+    current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Invalidate cached entries of a developer, group or repository
+    
+    Only matching entries are dropped, so they are re-fetched on the next
+    request without re-crawling everything else. The matching snapshots are
+    also marked as due, so the leader fetches them again, and the other
+    processes drop their cached copies on their next request.
+    """
+    tags = []
+    usernames = set()
+    if developer is not None:
+        tags.append(f"developer:{developer}")
+        usernames.add(developer)
+    if group is not None:
+        if group not in DEVELOPER_GROUPS:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Group '{group}' not found"
+            )
+        tags.extend(f"developer:{member}" for member in DEVELOPER_GROUPS[group])
+        usernames.update(DEVELOPER_GROUPS[group])
+    if repository is not None:
+        tags.append(f"repository:{repository.lower()}")
+        usernames.update(developer_prs.username for developer_prs in pr_index.by_repository(repository))
+    
+    if not tags:
+        raise HTTPException(
+            status_code=400,
+            detail="Specify a developer, group or repository to invalidate"
+        )
+    
+    if namespace is None:
+        invalidated = invalidate_tags(*tags)
+    elif namespace in get_namespaces():
+        invalidated = {namespace: get_cache(namespace).invalidate_tags(*tags)}
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Cache namespace '{namespace}' not found"
+        )
+    
+    snapshots = await broadcast_invalidation(sorted(usernames))
+    
+    return {
+        "message": f"Invalidated {sum(invalidated.values())} cache entries",
+        "invalidated": invalidated,
+        "snapshots": snapshots
+    }
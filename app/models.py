@@ -1,6 +1,6 @@
 """Pydantic models for API responses"""
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
 
@@ -33,4 +33,73 @@ class DeveloperPRs(BaseModel):
 class PRResponse(BaseModel):
     developers: List[DeveloperPRs]
     fetched_at: datetime
-    rate_limit_remaining: int
\ No newline at end of file
+    rate_limit_remaining: int
+    next_cursor: Optional[str] = None
+    # Change log position of the data, for /api/pull-requests/changes
+    version: Optional[int] = None
+    epoch: Optional[str] = None
+
+
+class PRChange(BaseModel):
+    username: str
+    change: str  # "added", "changed" or "removed"
+    pr_id: int
+    pull_request: Optional[PullRequest] = None
+
+
+class PRChangesResponse(BaseModel):
+    epoch: str
+    version: int
+    resync_required: bool
+    changes: List[PRChange]
+
+
+class HistoryPoint(BaseModel):
+    timestamp: datetime
+    open_prs: int
+    unresolved_comments: int
+    total_comments: int
+
+
+class HistoryResponse(BaseModel):
+    since: datetime
+    until: datetime
+    series: Dict[str, List[HistoryPoint]]
+
+
+class DurationStats(BaseModel):
+    count: int
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p95: Optional[float] = None
+    max: Optional[float] = None
+
+
+class StalePR(BaseModel):
+    username: str
+    id: int
+    number: int
+    title: str
+    repository: str
+    url: str
+    idle_hours: float
+
+
+class ReviewStats(BaseModel):
+    open_prs: int
+    unresolved_comments: int
+    prs_without_comments: int
+    pr_age_hours: DurationStats
+    time_to_first_comment_hours: DurationStats
+    hours_since_last_comment: DurationStats
+    stale_prs: List[StalePR]
+    computed_at: datetime
+
+
+class DeveloperStats(ReviewStats):
+    username: str
+
+
+class GroupStats(ReviewStats):
+    group: str
+    developers: List[DeveloperStats]
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""Server-side filtering, field projection and cursor pagination for PR data"""
+import base64
+import binascii
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models import DeveloperPRs, PullRequest
+
+# Fields that can be requested through the `fields=` query parameter
+PROJECTABLE_FIELDS = set(PullRequest.model_fields.keys())
+
+MAX_PAGE_SIZE = 500
+
+
+class QueryError(ValueError):
+    """Raised when query parameters are invalid"""
+
+
+@dataclass
+class PRQuery:
+    """Filters applied to cached PR data before it is serialized"""
+    repo: Optional[str] = None
+    reviewer: Optional[str] = None
+    min_unresolved: Optional[int] = None
+    older_than: Optional[int] = None  # days
+
+    @property
+    def is_active(self) -> bool:
+        return any(
+            value is not None
+            for value in (self.repo, self.reviewer, self.min_unresolved, self.older_than)
+        )
+
+
+def _repo_matches(pr: PullRequest, repo: str) -> bool:
+    """Match on the full `owner/name` or, if no owner is given, on the name alone"""
+    full_name = pr.repository.lower()
+    repo = repo.lower()
+    if "/" in repo:
+        return full_name == repo
+    return full_name.rsplit("/", 1)[-1] == repo
+
+
+def matches(pr: PullRequest, query: PRQuery, now: datetime) -> bool:
+    """Check if a single PR satisfies all filters of the query"""
+    if query.repo is not None and not _repo_matches(pr, query.repo):
+        return False
+
+    if query.reviewer is not None:
+        reviewer = query.reviewer.lower()
+        if not any(r.lower() == reviewer for r in pr.reviewers):
+            return False
+
+    if query.min_unresolved is not None and pr.review_comments.unresolved < query.min_unresolved:
+        return False
+
+    if query.older_than is not None:
+        created_at = pr.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if now - created_at < timedelta(days=query.older_than):
+            return False
+
+    return True
+
+
+def filter_developer_prs(
+    developers: List[DeveloperPRs],
+    query: PRQuery,
+    aged: Optional[Dict[str, Set[int]]] = None
+) -> List[DeveloperPRs]:
+    """
+    Apply the query to every developer's PRs
+
+    Developers left without any matching PR are dropped when a filter is
+    active, so filtered responses only carry relevant data. `aged` holds the
+    PR ids per developer that satisfy `older_than`, looked up in the age
+    index; without it the age of every PR is checked.
+    """
+    if not query.is_active:
+        return developers
+
+    now = datetime.now(timezone.utc)
+    if aged is not None:
+        query = replace(query, older_than=None)
+    filtered = []
+    for developer in developers:
+        prs = developer.pull_requests
+        if aged is not None:
+            old_enough = aged.get(developer.username, ())
+            prs = [pr for pr in prs if pr.id in old_enough]
+        prs = [pr for pr in prs if matches(pr, query, now)]
+        if prs:
+            filtered.append(DeveloperPRs(username=developer.username, pull_requests=prs))
+    return filtered
+
+
+def encode_cursor(username: str, pr_id: int) -> str:
+    """Build an opaque cursor pointing at the last PR of a page"""
+    raw = f"{pr_id}:{username}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor created by `encode_cursor`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        pr_id, username = raw.split(":", 1)
+        return username, int(pr_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise QueryError("Invalid cursor")
+
+
+def paginate(
+    developers: List[DeveloperPRs],
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[DeveloperPRs], Optional[str]]:
+    """
+    Return one page of at most `limit` PRs and the cursor for the next page
+
+    PRs are walked in the order of the cached data (developer order, then PR
+    order), so a cursor stays valid for as long as the cached entry lives.
+    Developers without PRs in the page are omitted.
+    """
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise QueryError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    after = decode_cursor(cursor) if cursor else None
+    started = after is None
+    page: List[DeveloperPRs] = []
+    taken = 0
+    last: Optional[Tuple[str, int]] = None
+    has_more = False
+
+    for developer in developers:
+        page_prs = []
+        for pr in developer.pull_requests:
+            if not started:
+                started = (developer.username, pr.id) == after
+                continue
+            if taken == limit:
+                has_more = True
+                break
+            page_prs.append(pr)
+            taken += 1
+            last = (developer.username, pr.id)
+        if page_prs:
+            page.append(DeveloperPRs(username=developer.username, pull_requests=page_prs))
+        if has_more:
+            break
+
+    if not started:
+        raise QueryError("Cursor does not match current data, restart pagination")
+
+    next_cursor = encode_cursor(*last) if has_more and last else None
+    return page, next_cursor
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Parse a comma-separated `fields=` parameter into a set of PR field names"""
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - PROJECTABLE_FIELDS
+    if unknown:
+        raise QueryError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested
+
+
+def projection(fields: Set[str]) -> Dict[str, Any]:
+    """Build a pydantic `include` spec that keeps only the given PR fields"""
+    return {
+        "developers": {
+            "__all__": {
+                "username": True,
+                "pull_requests": {"__all__": {field: True for field in fields}},
+            }
+        },
+        "fetched_at": True,
+        "rate_limit_remaining": True,
+        "next_cursor": True,
+        "version": True,
+        "epoch": True,
+    }
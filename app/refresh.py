@@ -0,0 +1,185 @@
+"""Adaptive per-developer refresh intervals"""
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from app.config import (
+    REFRESH_MIN_TTL_SECONDS, REFRESH_MAX_TTL_SECONDS,
+    REFRESH_DEFAULT_TTL_SECONDS, REFRESH_CALL_BUDGET_PER_HOUR
+)
+
+# Weight of the latest refresh in the change-rate average
+CHANGE_ALPHA = 0.3
+# Time constant of the decaying access counter
+ACCESS_TAU_SECONDS = 3600.0
+# How often the allocation is recomputed
+ALLOCATION_INTERVAL_SECONDS = 60.0
+# Keeps idle or unchanged developers from getting a zero weight
+WEIGHT_FLOOR = 0.05
+# Developers neither requested nor refreshed for this many `max_ttl` are forgotten
+FORGET_AFTER_MAX_TTLS = 2
+
+
+@dataclass
+class _DeveloperActivity:
+    change_rate: float = 0.5
+    calls_per_refresh: float = 1.0
+    signature: Optional[int] = None
+    refreshes: int = 0
+    access_score: float = 0.0
+    access_updated: float = 0.0
+    refreshed_at: float = 0.0
+
+    def access_rate(self, now: float) -> float:
+        """Decayed accesses per hour"""
+        decay = math.exp(-(now - self.access_updated) / ACCESS_TAU_SECONDS)
+        return self.access_score * decay * 3600 / ACCESS_TAU_SECONDS
+
+
+class RefreshScheduler:
+    """
+    Chooses how long each developer's PRs stay cached
+
+    Each developer is weighted by how often their PRs actually changed in
+    recent refreshes and by how often their data (directly or through a
+    group) is requested. Every developer is refreshed at least every
+    `max_ttl` seconds; the rest of the hourly GitHub call budget is shared in
+    proportion to the weights, so refreshes go where data is both changing
+    and being viewed, and no developer is refreshed more often than every
+    `min_ttl` seconds. Developers that are neither requested nor refreshed
+    any more (e.g. one-off lookups) are forgotten, so they stop holding on
+    to a share of the budget.
+    """
+
+    def __init__(
+        self,
+        min_ttl: float = REFRESH_MIN_TTL_SECONDS,
+        max_ttl: float = REFRESH_MAX_TTL_SECONDS,
+        default_ttl: float = REFRESH_DEFAULT_TTL_SECONDS,
+        call_budget_per_hour: float = REFRESH_CALL_BUDGET_PER_HOUR
+    ):
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.default_ttl = default_ttl
+        self.call_budget_per_hour = call_budget_per_hour
+        self._lock = threading.Lock()
+        self._activity: Dict[str, _DeveloperActivity] = {}
+        self._ttls: Dict[str, float] = {}
+        self._allocated_at = 0.0
+
+    def _get(self, username: str) -> _DeveloperActivity:
+        if username not in self._activity:
+            self._activity[username] = _DeveloperActivity()
+        return self._activity[username]
+
+    def record_refresh(self, username: str, signature: int, api_calls: int, now: Optional[float] = None):
+        """
+        Record a completed refresh of a developer
+
+        Args:
+            username: Developer that was refreshed
+            signature: Hash of the refreshed data, used to detect changes
+            api_calls: GitHub calls the refresh cost
+        """
+        with self._lock:
+            activity = self._get(username)
+            if activity.signature is not None:
+                changed = 1.0 if signature != activity.signature else 0.0
+                activity.change_rate += CHANGE_ALPHA * (changed - activity.change_rate)
+            activity.signature = signature
+            activity.refreshed_at = now or time.time()
+            activity.refreshes += 1
+            activity.calls_per_refresh += CHANGE_ALPHA * (max(api_calls, 1) - activity.calls_per_refresh)
+            if activity.refreshes == 1:
+                activity.calls_per_refresh = max(api_calls, 1)
+
+    def record_access(self, usernames: Iterable[str], now: Optional[float] = None):
+        """Record that the data of these developers was requested"""
+        now = now or time.time()
+        with self._lock:
+            for username in usernames:
+                activity = self._get(username)
+                decay = math.exp(-(now - activity.access_updated) / ACCESS_TAU_SECONDS)
+                activity.access_score = activity.access_score * decay + 1.0
+                activity.access_updated = now
+
+    def _allocate(self, now: float):
+        """Share the call budget between developers (water-filling)"""
+        forget_before = now - FORGET_AFTER_MAX_TTLS * self.max_ttl
+        for username in [
+            username for username, activity in self._activity.items()
+            if max(activity.access_updated, activity.refreshed_at) < forget_before
+        ]:
+            del self._activity[username]
+
+        if not self._activity:
+            self._ttls = {}
+            return
+
+        min_freq = 3600 / self.max_ttl  # refreshes per hour
+        max_freq = 3600 / self.min_ttl
+        weights = {
+            username: (activity.change_rate + WEIGHT_FLOOR) * (activity.access_rate(now) + WEIGHT_FLOOR)
+            for username, activity in self._activity.items()
+        }
+        costs = {username: activity.calls_per_refresh for username, activity in self._activity.items()}
+        freqs = {username: min_freq for username in weights}
+
+        budget = self.call_budget_per_hour - sum(min_freq * costs[u] for u in freqs)
+        active = set(freqs)
+        while budget > 1e-9 and active:
+            total_weight = sum(weights[u] for u in active)
+            if total_weight <= 0:
+                break
+            # Extra refreshes per hour a developer gets for its share of the budget
+            saturated = set()
+            spent = 0.0
+            for username in active:
+                share = budget * weights[username] / total_weight
+                extra = share / costs[username]
+                if freqs[username] + extra >= max_freq:
+                    spent += (max_freq - freqs[username]) * costs[username]
+                    freqs[username] = max_freq
+                    saturated.add(username)
+                else:
+                    freqs[username] += extra
+                    spent += share
+            budget -= spent
+            if not saturated:
+                break
+            active -= saturated
+
+        self._ttls = {username: 3600 / freq for username, freq in freqs.items()}
+        self._allocated_at = now
+
+    def ttl_for(self, username: str, now: Optional[float] = None) -> int:
+        """Cache TTL in seconds for a developer's PRs"""
+        now = now or time.time()
+        with self._lock:
+            if now - self._allocated_at >= ALLOCATION_INTERVAL_SECONDS or username not in self._ttls:
+                self._allocate(now)
+            ttl = self._ttls.get(username)
+        if ttl is None:
+            return int(self.default_ttl)
+        return int(round(ttl))
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Current schedule per developer"""
+        now = time.time()
+        with self._lock:
+            self._allocate(now)
+            return {
+                username: {
+                    "ttl_seconds": round(self._ttls[username]),
+                    "change_rate": round(activity.change_rate, 3),
+                    "accesses_per_hour": round(activity.access_rate(now), 2),
+                    "calls_per_refresh": round(activity.calls_per_refresh, 1)
+                }
+                for username, activity in self._activity.items()
+            }
+
+
+# Global scheduler instance
+refresh_scheduler = RefreshScheduler()
@@ -0,0 +1,228 @@
+"""Retry with backoff and circuit breakers for GitHub API calls"""
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from github import GithubException
+from requests.exceptions import ConnectionError, Timeout
+
+from app.config import (
+    GITHUB_RETRY_ATTEMPTS, GITHUB_RETRY_BASE_DELAY, GITHUB_RETRY_MAX_DELAY,
+    GITHUB_BREAKER_THRESHOLD, GITHUB_BREAKER_RESET_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit is open"""
+
+    def __init__(self, endpoint: str, retry_at: float):
+        self.endpoint = endpoint
+        self.retry_at = retry_at
+        super().__init__(f"Circuit for GitHub '{endpoint}' calls is open")
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Transient server errors, timeouts and rate limits are worth retrying"""
+    if isinstance(exc, (ConnectionError, Timeout)):
+        return True
+    if isinstance(exc, GithubException):
+        if exc.status in RETRYABLE_STATUSES:
+            return True
+        # Secondary rate limits are reported as 403
+        return exc.status == 403 and "rate limit" in str(exc).lower()
+    return False
+
+
+def server_delay(exc: Exception, now: Optional[float] = None) -> Optional[float]:
+    """Delay requested by GitHub through Retry-After or X-RateLimit-Reset"""
+    headers = getattr(exc, "headers", None)
+    now = now or time.time()
+
+    retry_after = _header(headers, "retry-after")
+    if retry_after is not None:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+
+    if _header(headers, "x-ratelimit-remaining") == "0":
+        reset = _header(headers, "x-ratelimit-reset")
+        if reset is not None:
+            try:
+                return max(float(reset) - now, 0.0)
+            except ValueError:
+                pass
+
+    return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring server-requested delays"""
+
+    def __init__(
+        self,
+        attempts: int = GITHUB_RETRY_ATTEMPTS,
+        base_delay: float = GITHUB_RETRY_BASE_DELAY,
+        max_delay: float = GITHUB_RETRY_MAX_DELAY
+    ):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered delay before retry number `attempt` (0-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one class of GitHub endpoints
+
+    After `threshold` consecutive failures the circuit opens and calls are
+    rejected until `reset_seconds` have passed (or until the time GitHub told
+    us to wait). Then one trial call is let through: success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = GITHUB_BREAKER_THRESHOLD,
+        reset_seconds: float = GITHUB_BREAKER_RESET_SECONDS
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._half_open = False
+        self._stats = {"successes": 0, "failures": 0, "rejections": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._open_until > time.time():
+            return "open"
+        if self._failures >= self.threshold:
+            return "half_open"
+        return "closed"
+
+    def allow(self) -> bool:
+        """Check if a call may go through"""
+        with self._lock:
+            if self._open_until > time.time():
+                self._stats["rejections"] += 1
+                return False
+            if self._failures >= self.threshold:
+                # Half open: a single trial call at a time
+                if self._half_open:
+                    self._stats["rejections"] += 1
+                    return False
+                self._half_open = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._half_open = False
+            self._stats["successes"] += 1
+
+    def record_failure(self, open_for: Optional[float] = None):
+        """Count a failure, `open_for` forces the circuit open for that long"""
+        with self._lock:
+            self._failures += 1
+            self._half_open = False
+            self._stats["failures"] += 1
+            duration = open_for or 0.0
+            if self._failures >= self.threshold:
+                duration = max(duration, self.reset_seconds)
+            if duration:
+                self._open_until = max(self._open_until, time.time() + duration)
+                self._stats["opened"] += 1
+                logger.warning(f"Circuit for GitHub '{self.name}' calls opened for {duration:.0f}s")
+
+    @property
+    def retry_at(self) -> float:
+        return self._open_until
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "open_until": self._open_until or None
+        }
+
+
+class ResilientCaller:
+    """Runs GitHub calls with retries, backoff and a circuit breaker per endpoint class"""
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, sleep: Callable[[float], None] = time.sleep):
+        self.policy = policy or RetryPolicy()
+        self._sleep = sleep
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self._breakers:
+                self._breakers[endpoint] = CircuitBreaker(endpoint)
+            return self._breakers[endpoint]
+
+    def call(self, endpoint: str, func: Callable, *args, **kwargs):
+        """
+        Call `func`, retrying transient failures
+
+        Non-retryable errors (e.g. 404) are raised right away and do not count
+        against the circuit. If GitHub asks to wait longer than the maximum
+        backoff, the circuit is opened for that time instead of sleeping.
+        """
+        breaker = self.breaker(endpoint)
+
+        for attempt in range(self.policy.attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(endpoint, breaker.retry_at)
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    breaker.record_success()
+                    raise
+
+                requested = server_delay(e)
+                if requested is not None and requested > self.policy.max_delay:
+                    breaker.record_failure(open_for=requested)
+                    raise
+
+                breaker.record_failure()
+                if attempt == self.policy.attempts - 1 or breaker.state == "open":
+                    raise
+
+                delay = requested if requested is not None else self.policy.backoff(attempt)
+                logger.warning(
+                    f"GitHub '{endpoint}' call failed ({e}), "
+                    f"retry {attempt + 1}/{self.policy.attempts - 1} in {delay:.1f}s"
+                )
+                self._sleep(delay)
+            else:
+                breaker.record_success()
+                return result
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.get_stats() for name, breaker in self._breakers.items()}
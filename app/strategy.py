@@ -0,0 +1,92 @@
+"""Choice between per-author and per-repository PR fetching by measured call cost"""
+import math
+import threading
+from typing import Any, Dict, Optional
+
+from app.config import GITHUB_FETCH_STRATEGY
+
+AUTHOR = "author"
+REPOSITORY = "repository"
+STRATEGIES = (AUTHOR, REPOSITORY)
+
+# Page size requested from GitHub for every list call
+PER_PAGE = 100
+# Weight of the latest measurement in the cost average
+COST_ALPHA = 0.3
+# Every this many decisions the costlier strategy is run to keep its cost current
+EXPLORE_EVERY = 20
+
+
+def pages(items: int, per_page: int = PER_PAGE) -> int:
+    """Requests a paginated list call took to return `items` items"""
+    return max(1, math.ceil(items / per_page))
+
+
+class FetchStrategySelector:
+    """
+    Picks, per organization, the cheaper way to refresh tracked developers
+
+    The per-author strategy searches one developer's PRs and loads each PR
+    and its comments on its own. The per-repository strategy lists the open
+    PRs and comments of every repository the developers work in, once for
+    all of them. Costs are compared as GitHub calls per developer refreshed,
+    averaged over recent refreshes; an unmeasured strategy is tried first,
+    and the costlier one is tried again every `explore_every` decisions in
+    case the balance shifted.
+    """
+
+    def __init__(self, mode: str = GITHUB_FETCH_STRATEGY, explore_every: int = EXPLORE_EVERY):
+        if mode != "auto" and mode not in STRATEGIES:
+            raise ValueError(f"Unknown fetch strategy '{mode}', expected auto, author or repository")
+        self.mode = mode
+        self.explore_every = explore_every
+        self._lock = threading.Lock()
+        self._costs: Dict[str, Dict[str, float]] = {}
+        self._decisions: Dict[str, int] = {}
+
+    def choose(self, org: str) -> str:
+        """Strategy for the next refresh of an organization"""
+        if self.mode != "auto":
+            return self.mode
+
+        with self._lock:
+            costs = self._costs.get(org, {})
+            for strategy in STRATEGIES:
+                if strategy not in costs:
+                    return strategy
+
+            decisions = self._decisions.get(org, 0) + 1
+            self._decisions[org] = decisions
+            cheaper = min(STRATEGIES, key=lambda strategy: costs[strategy])
+            if decisions % self.explore_every == 0:
+                return REPOSITORY if cheaper == AUTHOR else AUTHOR
+            return cheaper
+
+    def record(self, org: str, strategy: str, calls: int, developers: int):
+        """Record the calls a refresh of `developers` developers took"""
+        cost = calls / max(developers, 1)
+        with self._lock:
+            costs = self._costs.setdefault(org, {})
+            previous = costs.get(strategy)
+            costs[strategy] = cost if previous is None else previous + COST_ALPHA * (cost - previous)
+
+    def cost(self, org: str, strategy: str) -> Optional[float]:
+        with self._lock:
+            return self._costs.get(org, {}).get(strategy)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            organizations = {
+                org: {
+                    "calls_per_developer": {
+                        strategy: round(cost, 2) for strategy, cost in costs.items()
+                    },
+                    "preferred": min(costs, key=costs.get) if costs else None
+                }
+                for org, costs in self._costs.items()
+            }
+        return {"mode": self.mode, "organizations": organizations}
+
+
+# Global strategy selector instance
+fetch_strategy = FetchStrategySelector()
@@ -0,0 +1,173 @@
+"""WebSocket subscriptions pushing PR changes to dashboards"""
+import asyncio
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from app.changes import Change
+from app.config import SUBSCRIPTION_QUEUE_SIZE
+from app.models import PRChange
+
+
+def encode(message: Dict[str, Any]) -> str:
+    return json.dumps(message, separators=(",", ":"))
+
+
+RESYNC_MESSAGE = encode({"type": "resync", "reason": "client fell behind"})
+
+
+class Subscriber:
+    """One WebSocket connection and the encoded messages waiting to be sent"""
+
+    def __init__(self, queue_size: int):
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        self.developers: Set[str] = set()
+        self.overflows = 0
+
+    def offer(self, message: str):
+        """
+        Queue a message without ever waiting for the client
+
+        A client that falls `queue_size` messages behind has its backlog
+        dropped and replaced by a single resync message, so it reloads over
+        HTTP instead of slowing down delivery to everyone else.
+        """
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_MESSAGE)
+
+
+class SubscriptionHub:
+    """
+    Fans refresh results out to the WebSocket clients subscribed to them
+
+    Messages are encoded once per refresh and the same string is queued for
+    every subscriber of the developer. Publishing can happen from any thread;
+    delivery runs on the event loop the clients are connected to.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIPTION_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[Subscriber] = set()
+        self._by_developer: Dict[str, Set[Subscriber]] = {}
+        self._last_rate_limit: Optional[Dict[str, Any]] = None
+        self._messages_published = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def connect(self) -> Subscriber:
+        """Register a new connection, must be called from the event loop"""
+        subscriber = Subscriber(self.queue_size)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def disconnect(self, subscriber: Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            self._remove(subscriber, list(subscriber.developers))
+
+    def subscribe(self, subscriber: Subscriber, developers: Iterable[str]):
+        with self._lock:
+            for username in developers:
+                subscriber.developers.add(username)
+                self._by_developer.setdefault(username, set()).add(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber, developers: Iterable[str]):
+        with self._lock:
+            self._remove(subscriber, developers)
+
+    def _remove(self, subscriber: Subscriber, developers: Iterable[str]):
+        for username in developers:
+            subscriber.developers.discard(username)
+            subscribers = self._by_developer.get(username)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._by_developer[username]
+
+    def subscribed_developers(self) -> List[str]:
+        with self._lock:
+            return list(self._by_developer)
+
+    def publish_changes(self, username: str, changes: List[Change], epoch: str):
+        """Push a developer's changed PRs to the subscribers of that developer"""
+        with self._lock:
+            targets = list(self._by_developer.get(username, ()))
+        if not targets or not changes:
+            return
+
+        message = encode({
+            "type": "changes",
+            "epoch": epoch,
+            "version": changes[-1].version,
+            "username": username,
+            "changes": [
+                PRChange(
+                    username=change.username,
+                    change=change.change,
+                    pr_id=change.pr_id,
+                    pull_request=change.record.to_model() if change.record else None
+                ).model_dump(mode="json")
+                for change in changes
+            ]
+        })
+        self._deliver(targets, message)
+
+    def publish_rate_limit(self, rate_limit: Dict[str, Any]):
+        """Push the rate limit to every subscriber, only when it changed"""
+        with self._lock:
+            if rate_limit == self._last_rate_limit:
+                return
+            self._last_rate_limit = rate_limit
+            targets = list(self._subscribers)
+        if targets:
+            self._deliver(targets, encode({"type": "rate_limit", **rate_limit}))
+
+    def _deliver(self, targets: List[Subscriber], message: str):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        self._messages_published += 1
+
+        def fan_out():
+            for subscriber in targets:
+                subscriber.offer(message)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            fan_out()
+        else:
+            loop.call_soon_threadsafe(fan_out)
+
+    async def pump(self, subscriber: Subscriber, send: Callable[[str], Awaitable[None]]):
+        """Send queued messages to one client until the connection fails"""
+        while True:
+            message = await subscriber.queue.get()
+            await send(message)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "connections": len(self._subscribers),
+                "subscribed_developers": len(self._by_developer),
+                "messages_published": self._messages_published,
+                "queued_messages": sum(s.queue.qsize() for s in self._subscribers),
+                "overflows": sum(s.overflows for s in self._subscribers)
+            }
+
+
+# Global subscription hub instance
+subscription_hub = SubscriptionHub()
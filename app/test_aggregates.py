@@ -0,0 +1,83 @@
+"""Tests for aggregates module"""
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.aggregates import ReviewStatsAggregator, percentile
+from app.test_query import make_pr
+
+
+def test_percentile():
+    """Test interpolated percentiles"""
+    assert percentile([], 50) is None
+    assert percentile([4.0], 95) == 4.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([0.0, 10.0], 90) == 9.0
+
+
+def test_developer_and_group_stats():
+    """Test per-developer and merged group statistics"""
+    now = datetime.now(timezone.utc)
+    aggregator = ReviewStatsAggregator({"team": ["alice", "bob"], "solo": ["bob"]})
+
+    commented = make_pr(1, unresolved=2, age_days=10)
+    commented.first_comment_date = commented.created_at + timedelta(hours=4)
+    commented.last_comment_date = now - timedelta(hours=2)
+
+    assert aggregator.update_developer("alice", [commented, make_pr(2, age_days=1)])
+    assert aggregator.update_developer("bob", [make_pr(3, unresolved=1, age_days=5)])
+
+    alice = aggregator.get_developer_stats("alice", now=now)
+    assert alice.open_prs == 2
+    assert alice.unresolved_comments == 2
+    assert alice.prs_without_comments == 1
+    assert alice.time_to_first_comment_hours.p50 == pytest.approx(4.0)
+    assert alice.stale_prs == []
+
+    team = aggregator.get_group_stats("team", now=now)
+    assert team.open_prs == 3
+    assert team.unresolved_comments == 3
+    assert team.pr_age_hours.count == 3
+    assert team.pr_age_hours.p50 == pytest.approx(5 * 24, abs=0.01)
+    assert team.pr_age_hours.max == pytest.approx(10 * 24, abs=0.01)
+    assert [pr.id for pr in team.stale_prs] == [3]
+    assert [d.username for d in team.developers] == ["alice", "bob"]
+
+
+def test_unchanged_developer_is_not_recomputed():
+    """Test that identical data does not trigger a recomputation"""
+    aggregator = ReviewStatsAggregator({"team": ["alice"]})
+    prs = [make_pr(1)]
+
+    assert aggregator.update_developer("alice", prs) is True
+    aggregator.flush()
+    samples = aggregator._group_samples["team"]
+
+    assert aggregator.update_developer("alice", prs) is False
+    aggregator.flush()
+    assert aggregator._group_samples["team"] is samples
+
+
+def test_time_dependent_stats_follow_the_clock():
+    """Test that ages and staleness advance without any data change"""
+    now = datetime.now(timezone.utc)
+    aggregator = ReviewStatsAggregator({"team": ["alice"]})
+    pr = make_pr(1, age_days=1)
+    pr.last_comment_date = now - timedelta(hours=1)
+    aggregator.update_developer("alice", [pr])
+
+    fresh = aggregator.get_group_stats("team", now=now)
+    assert fresh.pr_age_hours.p50 == pytest.approx(24, abs=0.01)
+    assert fresh.stale_prs == []
+
+    later = now + timedelta(days=10)
+    assert aggregator.update_developer("alice", [pr]) is False
+    team = aggregator.get_group_stats("team", now=later)
+    assert team.computed_at == later
+    assert team.pr_age_hours.p50 == pytest.approx(11 * 24, abs=0.01)
+    assert team.hours_since_last_comment.p50 == pytest.approx(10 * 24 + 1, abs=0.01)
+    assert [stale.id for stale in team.stale_prs] == [1]
+    assert team.stale_prs[0].idle_hours == pytest.approx(10 * 24 + 1, abs=0.01)
+    assert team.developers[0].stale_prs == team.stale_prs
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,7 +1,8 @@
 """Tests for cache module"""
+import asyncio
 import time
 import pytest
-from app.cache import Cache, cached, cache_key
+from app.cache import Cache, cached, cache_key, clear_all, get_cache, invalidate_tags, make_key
 
 
 def test_cache_basic():
@@ -142,5 +143,93 @@ def test_cache_stats_hit_rate():
     assert stats["hit_rate"] == "66.7%"
 
 
+def test_cache_invalidate_tags():
+    """Test invalidating tagged entries"""
+    c = Cache()
+    
+    c.set("prs:alice", "a", ttl_seconds=60, tags=["developer:alice", "repository:realtyka/api"])
+    c.set("prs:bob", "b", ttl_seconds=60, tags=["developer:bob", "repository:realtyka/web"])
+    c.set("all", "ab", ttl_seconds=60, tags=["developer:alice", "developer:bob"])
+    
+    assert c.invalidate_tags("developer:alice") == 2
+    assert c.get("prs:alice") is None
+    assert c.get("all") is None
+    assert c.get("prs:bob") == "b"
+    
+    # Re-setting a key replaces its tags
+    c.set("prs:bob", "b2", ttl_seconds=60, tags=["developer:bob"])
+    assert c.invalidate_tags("repository:realtyka/web") == 0
+    assert c.get_stats()["invalidations"] == 2
+
+
+def test_cache_namespaces():
+    """Test that namespaces are isolated"""
+    first = get_cache("test-first")
+    second = get_cache("test-second")
+    assert get_cache("test-first") is first
+    
+    first.set("key", 1, ttl_seconds=60, tags=["developer:alice"])
+    second.set("key", 2, ttl_seconds=60, tags=["developer:alice"])
+    
+    first.clear()
+    assert second.get("key") == 2
+    
+    counts = invalidate_tags("developer:alice")
+    assert counts["test-second"] == 1
+    assert second.get("key") is None
+
+
+def test_durable_namespace_survives_unscoped_clearing():
+    """Test that clear_all and unscoped invalidation skip durable namespaces"""
+    durable = get_cache("test-durable", durable=True)
+    regular = get_cache("test-regular")
+    durable.set("key", 1, ttl_seconds=60, tags=["developer:alice"])
+    regular.set("key", 2, ttl_seconds=60, tags=["developer:alice"])
+    
+    counts = invalidate_tags("developer:alice")
+    assert "test-durable" not in counts
+    assert durable.get("key") == 1
+    
+    clear_all()
+    assert durable.get("key") == 1
+    assert regular.get("key") is None
+    
+    # Naming the namespace still clears it
+    durable.clear()
+    assert durable.get("key") is None
+
+
+def test_cached_decorator_namespace_and_coroutines():
+    """Test @cached on coroutines and per-function cache_clear"""
+    calls = []
+    
+    @cached(ttl_seconds=60)
+    async def fetch(x, flag=False):
+        calls.append(x)
+        return x * 2
+    
+    @cached(ttl_seconds=60)
+    def other(x):
+        return x
+    
+    assert asyncio.run(fetch(2)) == 4
+    assert asyncio.run(fetch(2)) == 4
+    assert asyncio.run(fetch(2, flag=True)) == 4
+    assert calls == [2, 2]
+    
+    other(1)
+    fetch.cache_clear()
+    assert fetch.cache_stats()["size"] == 0
+    assert other.cache_stats()["size"] == 1
+
+
+def test_make_key():
+    """Test cheap key derivation and fallback for unhashable arguments"""
+    assert make_key(("alice",), {}) == "alice"
+    assert make_key((1, 2), {"foo": "bar"}) == make_key((1, 2), {"foo": "bar"})
+    assert make_key((1, 2), {}) != make_key((1,), {"y": 2})
+    assert make_key(([1, 2],), {}) == cache_key([1, 2])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""Tests for changes module"""
+import pytest
+from app.changes import ChangeLog, SharedChangeLog
+from app.compact import compact_prs
+from app.test_query import make_pr
+
+
+def summary(changes):
+    return [(c.username, c.change, c.pr_id) for c in changes]
+
+
+def test_change_log_versions_and_deltas():
+    """Test added, changed and removed PRs between refreshes"""
+    log = ChangeLog()
+    first, second = make_pr(1), make_pr(2)
+
+    assert summary(log.record_refresh("alice", compact_prs([first, second]))) == [
+        ("alice", "added", 1), ("alice", "added", 2)
+    ]
+    assert log.version == 1
+
+    # Unchanged data does not create a version
+    assert log.record_refresh("alice", compact_prs([first, second])) == []
+    assert log.version == 1
+
+    changed = make_pr(1, unresolved=3)
+    changed.created_at = first.created_at
+    log.record_refresh("alice", compact_prs([changed]))
+    assert log.version == 2
+
+    assert summary(log.since(1)) == [("alice", "changed", 1), ("alice", "removed", 2)]
+    assert log.since(2) == []
+    assert summary(log.since(0)) == [("alice", "added", 1), ("alice", "removed", 2)]
+
+
+def test_change_log_requires_resync():
+    """Test resync for evicted versions, future versions and other epochs"""
+    log = ChangeLog(max_entries=2)
+    log.record_refresh("alice", compact_prs([make_pr(1)]))
+    log.record_refresh("bob", compact_prs([make_pr(2)]))
+    log.record_refresh("carol", compact_prs([make_pr(3)]))
+
+    assert log.since(0) is None
+    assert summary(log.since(1)) == [("bob", "added", 2), ("carol", "added", 3)]
+    assert log.since(5) is None
+    assert log.since(1, epoch="other-process") is None
+    assert log.since(1, epoch=log.epoch) is not None
+
+
+def test_shared_change_log_across_processes(tmp_path):
+    """Test that workers share versions and record each refresh once"""
+    path = str(tmp_path / "coordination.db")
+    leader, follower = SharedChangeLog(path), SharedChangeLog(path)
+    first = make_pr(1)
+
+    assert summary(leader.record_refresh("alice", compact_prs([first]))) == [("alice", "added", 1)]
+    assert follower.epoch == leader.epoch and follower.version == 1
+    assert summary(follower.since(0, epoch=leader.epoch)) == [("alice", "added", 1)]
+
+    # The follower applying the same snapshot does not create a version
+    assert follower.record_refresh("alice", compact_prs([first])) == []
+    assert follower.version == 1
+
+    changed = make_pr(1, unresolved=3)
+    changed.created_at = first.created_at
+    leader.record_refresh("alice", compact_prs([changed]))
+    leader.record_refresh("alice", compact_prs([]))
+
+    # The follower gets what it missed, coalesced, for its own subscribers
+    changes = follower.record_refresh("alice", compact_prs([]))
+    assert summary(changes) == [("alice", "removed", 1)] and changes[0].version == 3
+    assert follower.record_refresh("alice", compact_prs([])) == []
+    assert follower.since(3, epoch=leader.epoch) == []
+
+
+def test_shared_change_log_eviction(tmp_path):
+    """Test that evicted versions require a resync on every worker"""
+    path = str(tmp_path / "coordination.db")
+    log = SharedChangeLog(path, max_entries=2)
+    log.record_refresh("alice", compact_prs([make_pr(1)]))
+    log.record_refresh("bob", compact_prs([make_pr(2)]))
+    log.record_refresh("carol", compact_prs([make_pr(3)]))
+
+    other = SharedChangeLog(path, max_entries=2)
+    assert other.since(0) is None
+    assert summary(other.since(1)) == [("bob", "added", 2), ("carol", "added", 3)]
+    assert other.since(5) is None
+    assert other.since(1, epoch="other-database") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
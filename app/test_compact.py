@@ -0,0 +1,37 @@
+"""Tests for compact module"""
+import sys
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.compact import CompactPR, compact_prs, expand_prs
+from app.test_query import make_pr
+
+
+def test_compact_round_trip():
+    """Test that records convert back to identical API models"""
+    pr = make_pr(7, "Realtyka/api", unresolved=2, reviewers=["bob", "carol"])
+    pr.first_comment_date = pr.created_at + timedelta(hours=1)
+    pr.last_comment_date = pr.created_at + timedelta(hours=3)
+    pr.last_comment_by = "carol"
+    other = make_pr(8, "Realtyka/api")
+    other.url = "https://github.example.com/Realtyka/api/pull/8"
+
+    records = compact_prs([pr, other])
+    assert expand_prs(records) == [pr, other]
+    assert records[0].url is None
+    assert records[1].url == other.url
+
+
+def test_compact_interns_strings():
+    """Test that repeated strings are shared between records"""
+    repository = "".join(["Realtyka/", "api"])
+    first = CompactPR.from_model(make_pr(1, repository, reviewers=["bob"]))
+    second = CompactPR.from_model(make_pr(2, "".join(["Realtyka/", "api"]), reviewers=["bob"]))
+
+    assert first.repository is second.repository
+    assert first.repository is sys.intern("Realtyka/api")
+    assert first.reviewers[0] is second.reviewers[0]
+    assert not hasattr(first, "__dict__")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,252 @@
+"""Tests for github_service module"""
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from github import GithubException
+import app.github_service as github_service_module
+from app.cache import clear_all
+from app.changes import ChangeLog
+from app.compact import compact_prs
+from app.github_service import GitHubService, organization_token_variable, prs_cache, all_prs_cache, last_good_cache
+from app.indexes import pr_index
+from app.leader import LeaderElector, SnapshotStore
+from app.aggregates import review_stats
+from app.resilience import ResilientCaller
+from app.test_strategy import make_github_pr
+from app.test_query import make_pr
+
+
+class FakeClient:
+    """Answers PR searches per author, or fails with a preset error"""
+
+    def __init__(self, prs_by_author):
+        self.prs_by_author = prs_by_author
+        self.error = None
+        self.searches = 0
+        self.threads = set()
+        self.rate_limiting_resettime = time.time() + 600
+
+    def get_rate_limit(self):
+        if self.error is not None:
+            raise self.error
+        reset = datetime.now() + timedelta(hours=1)
+        return SimpleNamespace(core=SimpleNamespace(remaining=4000, limit=5000, reset=reset))
+
+    def search_issues(self, query):
+        self.searches += 1
+        self.threads.add(threading.current_thread().name)
+        if self.error is not None:
+            raise self.error
+        author = next(token[len("author:"):] for token in query.split() if token.startswith("author:"))
+        return [
+            SimpleNamespace(url=f"https://api.github.com/repos/Realtyka/api/issues/{pr.number}",
+                            as_pull_request=lambda pr=pr: pr)
+            for pr in self.prs_by_author.get(author, [])
+        ]
+
+
+@pytest.fixture
+def organizations():
+    """Organizations to configure instead of GITHUB_ORGANIZATIONS, set by parametrize"""
+    return None
+
+
+@pytest.fixture
+def service(monkeypatch, organizations):
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    if organizations is not None:
+        monkeypatch.setattr(github_service_module, "GITHUB_ORGANIZATIONS", organizations)
+    # Keep the shared history file and coordination database out of tests
+    monkeypatch.setattr(github_service_module, "history", None)
+    monkeypatch.setattr(github_service_module, "snapshot_store", None)
+    monkeypatch.setattr(github_service_module, "change_log", ChangeLog())
+    clear_all()
+    last_good_cache.clear()
+
+    github_service = GitHubService()
+    github_service.resilience = ResilientCaller(sleep=lambda seconds: None)
+    github_service.tracked_developers = []
+    github_service.clients = {
+        org: FakeClient({"svc-alice": [make_github_pr(1, "svc-alice", 2)]})
+        for org in github_service.organizations
+    }
+    yield github_service
+    github_service._executor.shutdown()
+    clear_all()
+    last_good_cache.clear()
+
+
+def test_failure_serves_last_good_without_caching_it(service):
+    """Test stale fallback, no caching of failures and retry after the delay"""
+    org = service.organizations[0]
+    client = service.clients[org]
+    cache_key = f"prs:{org}:svc-alice"
+
+    records, status = service._fetch_org_prs(org, "svc-alice")
+    assert status == "ok" and [r.id for r in records] == [1001]
+
+    prs_cache.delete(cache_key)
+    client.error = GithubException(502, {"message": "Bad Gateway"})
+    records, status = service._fetch_org_prs(org, "svc-alice")
+    assert status == "stale" and [r.id for r in records] == [1001]
+    assert prs_cache.get(cache_key) is None
+
+    # GitHub is not asked again before STALE_RETRY_SECONDS
+    searches = client.searches
+    assert service._fetch_org_prs(org, "svc-alice")[1] == "stale"
+    assert client.searches == searches
+
+    client.error = None
+    service._retry_at[cache_key] = time.time() - 1
+    records, status = service._fetch_org_prs(org, "svc-alice")
+    assert status == "ok" and client.searches == searches + 1
+
+
+def test_failure_without_last_good_keeps_index_and_stats(service):
+    """Test that an empty failed result does not replace known PRs"""
+    records, complete = service._fetch_developer_records("svc-alice")
+    assert complete and len(records) == len(service.organizations)
+
+    clear_all()
+    assert last_good_cache.get(f"prs:{service.organizations[0]}:svc-alice") is not None
+    last_good_cache.clear()
+    for client in service.clients.values():
+        client.error = GithubException(502, {"message": "Bad Gateway"})
+
+    records, complete = service._fetch_developer_records("svc-alice")
+    assert records == () and not complete
+    assert prs_cache.get("prs:svc-alice") is None
+    assert [d.username for d in pr_index.by_repository("Realtyka/api")] == ["svc-alice"]
+    assert review_stats.get_developer_stats("svc-alice").open_prs == len(service.organizations)
+
+
+def test_rate_limited_everywhere_raises(service):
+    """Test that a fully rate limited refresh is reported as such"""
+    for client in service.clients.values():
+        client.error = GithubException(403, {"message": "API rate limit exceeded"})
+
+    with pytest.raises(Exception, match="rate limit"):
+        service._fetch_developer_records("svc-alice")
+    assert all(service._is_rate_limited(org) for org in service.organizations)
+
+
+def test_leader_drops_snapshots_invalidated_elsewhere(service, monkeypatch, tmp_path):
+    """Test that the leader re-fetches a developer a follower invalidated"""
+    store = SnapshotStore(str(tmp_path / "coordination.db"))
+    monkeypatch.setattr(github_service_module, "snapshot_store", store)
+    monkeypatch.setattr(github_service_module, "leader_elector", LeaderElector(""))
+    service._fetch_developer_records("svc-alice")
+    searches = sum(client.searches for client in service.clients.values())
+    assert service.drop_invalidated_snapshots() == []
+
+    # A follower invalidates the developer
+    store.invalidate(["svc-alice"])
+    assert service.drop_invalidated_snapshots() == ["svc-alice"]
+    assert prs_cache.get("prs:svc-alice") is None
+
+    service._fetch_developer_records("svc-alice")
+    assert sum(client.searches for client in service.clients.values()) > searches
+    assert store.invalidated() == []
+
+
+def test_merged_results_expire_with_the_first_developer(service):
+    """Test that the all developers entry does not outlive a developer's entry"""
+    service.fetch_all_developer_prs(["svc-alice"])
+
+    # The developer's entry was cached a while ago and expires in 5 seconds
+    expires_at = time.time() + 5
+    service._developer_expiry["svc-alice"] = expires_at
+    all_prs_cache.clear()
+    service.fetch_all_developer_prs(["svc-alice"])
+    assert all_prs_cache._cache["all_prs:svc-alice"]["expires_at"] == pytest.approx(expires_at, abs=1)
+
+    # Nothing is cached once the developer's entry has expired
+    service._developer_expiry["svc-alice"] = time.time() - 1
+    all_prs_cache.clear()
+    service.fetch_all_developer_prs(["svc-alice"])
+    assert all_prs_cache.get("all_prs:svc-alice") is None
+
+
+@pytest.mark.parametrize("organizations", [["Realtyka", "other-org"]])
+def test_results_merge_across_organizations(service):
+    """Test that organizations are searched in parallel and their PRs merged"""
+    service.clients["other-org"].prs_by_author = {"svc-alice": [make_github_pr(2, "svc-alice", 1)]}
+
+    records, complete = service._fetch_developer_records("svc-alice")
+    assert complete
+    assert sorted(record.id for record in records) == [1001, 1002]
+    for client in service.clients.values():
+        assert client.searches == 1
+        assert all(name.startswith("github-org") for name in client.threads)
+
+
+@pytest.mark.parametrize("organizations", [["Realtyka", "other-org"]])
+def test_rate_limited_organization_is_skipped(service):
+    """Test that the other organizations still return while one is rate limited"""
+    limited = service.clients["other-org"]
+    limited.error = GithubException(403, {"message": "API rate limit exceeded"})
+
+    records, complete = service._fetch_developer_records("svc-alice")
+    assert [record.id for record in records] == [1001] and not complete
+    assert service._is_rate_limited("other-org") and not service._is_rate_limited("Realtyka")
+    searches = limited.searches
+
+    # Until its reset time the organization is not asked again
+    prs_cache.delete("prs:Realtyka:svc-alice")
+    records, complete = service._fetch_developer_records("svc-alice")
+    assert [record.id for record in records] == [1001] and not complete
+    assert limited.searches == searches and service.clients["Realtyka"].searches == 2
+
+
+def test_organization_tokens_select_clients(monkeypatch):
+    """Test that organizations with their own token get their own client"""
+    monkeypatch.setenv("GITHUB_TOKEN", "default-token")
+    monkeypatch.setenv("GITHUB_TOKEN_OTHER_ORG", "other-token")
+    monkeypatch.delenv("GITHUB_TOKEN_REALTYKA", raising=False)
+    monkeypatch.setattr(github_service_module, "GITHUB_ORGANIZATIONS", ["Realtyka", "other-org"])
+    monkeypatch.setattr(
+        github_service_module, "Github",
+        lambda token, **kwargs: SimpleNamespace(token=token)
+    )
+
+    assert organization_token_variable("other-org") == "GITHUB_TOKEN_OTHER_ORG"
+    github_service = GitHubService()
+    try:
+        assert github_service.clients["Realtyka"] is github_service.github
+        assert github_service.github.token == "default-token"
+        assert github_service.clients["other-org"].token == "other-token"
+    finally:
+        github_service._executor.shutdown()
+
+
+def test_invalidation_reaches_followers(service, monkeypatch, tmp_path):
+    """Test that a follower drops a cached snapshot invalidated by another process"""
+    path = str(tmp_path / "coordination.db")
+    store = SnapshotStore(path)
+    monkeypatch.setattr(github_service_module, "snapshot_store", store)
+    monkeypatch.setattr(github_service_module, "leader_elector", LeaderElector(path))
+
+    def served():
+        developers = service.fetch_all_developer_prs(["svc-alice"])
+        return [pr.id for pr in developers[0].pull_requests]
+
+    store.save("svc-alice", compact_prs([make_pr(1)]), ttl_seconds=3600)
+    assert served() == [1]
+
+    # The leader refreshed, the follower keeps its copy until it is due
+    store.save("svc-alice", compact_prs([make_pr(2)]), ttl_seconds=3600)
+    assert served() == [1]
+
+    store.invalidate(["svc-alice"])
+    assert served() == [2]
+
+    store.save("svc-alice", compact_prs([make_pr(3)]), ttl_seconds=3600)
+    store.invalidate(["*"])
+    assert served() == [3]
+    assert all(client.searches == 0 for client in service.clients.values())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
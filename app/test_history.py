@@ -0,0 +1,143 @@
+"""Tests for history module"""
+import fcntl
+import os
+import threading
+import pytest
+import app.history as history_module
+from app.history import HistoryStore, RECORD
+from app.test_query import make_pr
+
+
+DAY = 86400
+
+
+def test_history_records_only_changes(tmp_path):
+    """Test that unchanged snapshots are not appended"""
+    store = HistoryStore(str(tmp_path / "history.bin"))
+    prs = [make_pr(1, unresolved=2), make_pr(2, unresolved=1)]
+
+    assert store.record("alice", prs, timestamp=100) is True
+    assert store.record("alice", prs, timestamp=200) is False
+    assert store.record("alice", prs[:1], timestamp=300) is True
+    assert store.get_stats()["records"] == 2
+    assert store.get_stats()["size_bytes"] == 2 * RECORD.size
+
+    # Deltas survive a restart
+    reopened = HistoryStore(str(tmp_path / "history.bin"))
+    assert reopened.record("alice", prs[:1], timestamp=400) is False
+
+
+def test_history_range_query(tmp_path):
+    """Test range queries including the baseline value"""
+    store = HistoryStore(str(tmp_path / "history.bin"))
+    store.record("alice", [make_pr(1)], timestamp=100)
+    store.record("bob", [make_pr(2, unresolved=3)], timestamp=150)
+    store.record("alice", [make_pr(1), make_pr(3)], timestamp=300)
+    store.record("alice", [], timestamp=500)
+
+    series = store.query(["alice"], since=200, until=400)
+    assert series == {"alice": [(200, 1, 0, 0), (300, 2, 0, 0)]}
+
+    series = store.query(None, since=400)
+    assert series["bob"] == [(400, 1, 3, 3)]
+    assert series["alice"] == [(400, 2, 0, 0), (500, 0, 0, 0)]
+
+    assert store.query(["unknown"], since=0) == {}
+
+
+def test_history_query_sees_developers_added_elsewhere(tmp_path):
+    """Test that a reader finds developers registered by another process"""
+    path = str(tmp_path / "history.bin")
+    reader = HistoryStore(path)
+    writer = HistoryStore(path)
+    writer.record("carol", [make_pr(1, unresolved=2)], timestamp=100)
+
+    assert reader.query(["carol"], since=0) == {"carol": [(100, 1, 2, 2)]}
+
+
+def test_history_compaction(tmp_path):
+    """Test downsampling to hourly and daily values and retention"""
+    store = HistoryStore(str(tmp_path / "history.bin"))
+    now = 1000 * DAY
+
+    # Expired, daily range (2 values in one day), hourly range (2 in one hour), recent
+    timestamps = [
+        now - 400 * DAY,
+        now - 40 * DAY, now - 40 * DAY + 60,
+        now - 10 * DAY, now - 10 * DAY + 60,
+        now - 60, now - 30,
+    ]
+    for i, timestamp in enumerate(timestamps):
+        store.record("alice", [make_pr(n) for n in range(i + 1)], timestamp=timestamp)
+
+    assert store.compact(now=now) == 2
+
+    # The expired value stays as the baseline at the start of the retention window
+    series = store.query(["alice"], since=0)["alice"]
+    assert [point[0] for point in series] == [
+        now - 365 * DAY, now - 40 * DAY + 60, now - 10 * DAY + 60, now - 60, now - 30
+    ]
+    assert [point[1] for point in series] == [1, 3, 5, 6, 7]
+
+
+def test_history_compaction_keeps_unchanged_developers(tmp_path):
+    """Test that a developer whose values last changed before retention is kept"""
+    store = HistoryStore(str(tmp_path / "history.bin"))
+    now = 1000 * DAY
+    store.record("alice", [make_pr(1)], timestamp=now - 400 * DAY)
+    store.record("bob", [make_pr(2)], timestamp=now - 400 * DAY + 60)
+    store.record("bob", [], timestamp=now - 380 * DAY)
+
+    assert store.compact(now=now) == 1
+    series = store.query(None, since=now - 7 * DAY)
+    assert series == {"alice": [(now - 7 * DAY, 1, 0, 0)], "bob": [(now - 7 * DAY, 0, 0, 0)]}
+
+
+def test_history_baseline_reads_only_needed_records(tmp_path, monkeypatch):
+    """Test that developers without an earlier record do not scan the whole file"""
+    path = str(tmp_path / "history.bin")
+    store = HistoryStore(path)
+    for i in range(1000):
+        store.record("alice", [make_pr(n) for n in range(i % 2 + 1)], timestamp=i + 1)
+    store.record("bob", [make_pr(1)], timestamp=2000)
+
+    reads = []
+
+    class CountingRecord:
+        size = RECORD.size
+
+        def unpack_from(self, buffer, offset):
+            reads.append(offset)
+            return RECORD.unpack_from(buffer, offset)
+
+    store.query(["alice"], since=0)
+    monkeypatch.setattr(history_module, "RECORD", CountingRecord())
+    assert store.query(["bob"], since=1500) == {"bob": [(2000, 1, 0, 0)]}
+    assert store.query(None, since=3000) == {"alice": [(3000, 2, 0, 0)], "bob": [(3000, 1, 0, 0)]}
+    assert len(reads) < 50
+
+
+def test_history_append_waits_for_compaction_in_another_process(tmp_path):
+    """Test that a record written during compaction lands in the compacted file"""
+    path = str(tmp_path / "history.bin")
+    store = HistoryStore(path)
+    store.record("alice", [make_pr(1)], timestamp=100)
+
+    # Another process holds the lock while it rewrites the file
+    with open(path, "ab") as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        writer = threading.Thread(target=store.record, args=("bob", [make_pr(2)], 200))
+        writer.start()
+        writer.join(timeout=0.2)
+        assert writer.is_alive()
+
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(RECORD.pack(100, 0, 1, 0, 0))
+        os.replace(f"{path}.tmp", path)
+    writer.join(timeout=5)
+
+    assert set(HistoryStore(path).query(None, since=0)) == {"alice", "bob"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,56 @@
+"""Tests for indexes module"""
+import pytest
+from app.indexes import PRIndex
+from app.compact import compact_prs
+from app.test_query import make_pr
+
+
+def pr_ids(developer_prs):
+    return sorted(pr.id for d in developer_prs for pr in d.pull_requests)
+
+
+def test_index_lookups():
+    """Test repository, reviewer and age lookups"""
+    index = PRIndex()
+    index.update_developer("alice", compact_prs([
+        make_pr(1, "Realtyka/api", reviewers=["bob"], age_days=10),
+        make_pr(2, "Realtyka/web", reviewers=["Carol"], age_days=1),
+    ]))
+    index.update_developer("bob", compact_prs([
+        make_pr(3, "Realtyka/api", reviewers=["alice", "carol"], age_days=20),
+    ]))
+
+    result = index.by_repository("realtyka/API")
+    assert pr_ids(result) == [1, 3]
+    assert [d.username for d in result] == ["alice", "bob"]
+
+    assert pr_ids(index.by_reviewer("carol")) == [2, 3]
+    assert pr_ids(index.older_than(7)) == [1, 3]
+    assert pr_ids(index.older_than(15)) == [3]
+    assert index.older_than_ids(7) == {"alice": {1}, "bob": {3}}
+    assert index.by_repository("Realtyka/missing") == []
+
+
+def test_index_incremental_update():
+    """Test that refreshing a developer replaces only their entries"""
+    index = PRIndex()
+    index.update_developer("alice", compact_prs([make_pr(1, "Realtyka/api", reviewers=["bob"])]))
+    index.update_developer("bob", compact_prs([make_pr(2, "Realtyka/api", reviewers=["alice"])]))
+
+    index.update_developer("alice", compact_prs([make_pr(4, "Realtyka/web", reviewers=["carol"])]))
+
+    assert pr_ids(index.by_repository("Realtyka/api")) == [2]
+    assert pr_ids(index.by_repository("Realtyka/web")) == [4]
+    assert index.by_reviewer("bob") == []
+
+    index.remove_developer("bob")
+    assert index.get_stats() == {
+        "developers": 1,
+        "repositories": 1,
+        "reviewers": 1,
+        "age_buckets": 1,
+    }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,108 @@
+"""Tests for leader module"""
+import time
+import pytest
+import app.leader as leader_module
+from app.compact import compact_prs
+from app.leader import LeaderElector, SnapshotStore
+from app.test_query import make_pr
+
+
+def test_single_leader_and_failover(tmp_path):
+    """Test that one process leads and another takes over an expired lease"""
+    path = str(tmp_path / "coordination.db")
+    first = LeaderElector(path, lease_seconds=30)
+    second = LeaderElector(path, lease_seconds=30)
+
+    assert first.renew() is True
+    assert second.renew() is False
+    assert first.renew() is True
+    assert second.current_leader()["holder"] == first.identity
+
+    # The first leader stops renewing and its lease runs out
+    assert second.renew(now=time.time() + 31) is True
+    assert first.renew() is False
+    assert first.is_leader is False
+
+
+def test_release_hands_over_immediately(tmp_path):
+    """Test that a released lease can be taken without waiting"""
+    path = str(tmp_path / "coordination.db")
+    first, second = LeaderElector(path), LeaderElector(path)
+    first.renew()
+    first.release()
+
+    assert first.is_leader is False
+    assert first.current_leader() is None
+    assert second.renew() is True
+
+
+def test_leader_steps_down_when_lease_lapses(tmp_path):
+    """Test that a leader unable to renew stops acting as leader"""
+    elector = LeaderElector(str(tmp_path / "coordination.db"), lease_seconds=0.05)
+    assert elector.renew() is True
+    time.sleep(0.1)
+    assert elector.is_leader is False
+
+
+def test_disabled_election_always_leads():
+    """Test that every process leads without a database"""
+    elector = LeaderElector("")
+    assert elector.is_leader is True
+    assert elector.renew() is True
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test that followers read the records published by the leader"""
+    store = SnapshotStore(str(tmp_path / "coordination.db"))
+    records = compact_prs([make_pr(1, unresolved=2), make_pr(2)])
+
+    assert store.load("alice") is None
+    store.save("alice", records, ttl_seconds=600)
+    loaded, refresh_due = store.load("alice")
+
+    assert [r.to_model() for r in loaded] == [r.to_model() for r in records]
+    assert refresh_due == pytest.approx(time.time() + 600, abs=5)
+
+
+def test_invalidated_snapshots_are_due_for_the_leader(tmp_path):
+    """Test that invalidated snapshots are listed until the leader saves them again"""
+    store = SnapshotStore(str(tmp_path / "coordination.db"))
+    records = compact_prs([make_pr(1)])
+    store.save("alice", records, ttl_seconds=600)
+    store.save("bob", records, ttl_seconds=600)
+
+    assert store.invalidate(["alice", "carol"]) == 1
+    assert store.invalidated() == ["alice"]
+    assert store.invalidate(["*"]) == 2
+    assert store.invalidated() == ["alice", "bob"]
+    store.save("bob", records, ttl_seconds=600)
+    assert store.load("alice")[1] == 0
+
+    store.save("alice", records, ttl_seconds=600)
+    assert store.invalidated() == []
+
+
+def test_invalidation_log(tmp_path, monkeypatch):
+    """Test that processes read the invalidations made since they last looked"""
+    monkeypatch.setattr(leader_module, "INVALIDATION_LOG_ENTRIES", 3)
+    store = SnapshotStore(str(tmp_path / "coordination.db"))
+
+    usernames, seq = store.invalidations_since(None)
+    assert usernames == []
+    store.invalidate(["alice", "bob"])
+    usernames, seq = store.invalidations_since(seq)
+    assert usernames == ["alice", "bob"]
+    assert store.invalidations_since(seq) == ([], seq)
+
+    store.invalidate(["*"])
+    usernames, seq = store.invalidations_since(seq)
+    assert usernames is None
+
+    # A process too far behind has missed entries and drops everything
+    store.invalidate(["alice", "bob", "carol", "dave"])
+    assert store.invalidations_since(seq)[0] is None
+    assert store.invalidations_since(seq + 1)[0] == ["bob", "carol", "dave"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+"""Tests for the HTTP endpoints in main module"""
+import pytest
+from fastapi.testclient import TestClient
+import app.github_service as github_service_module
+import app.main as main_module
+from app.auth import UserInfo, get_current_user
+from app.cache import clear_all
+from github import GithubException
+from app.changes import ChangeLog, SharedChangeLog
+from app.compact import compact_prs
+from app.config import DEVELOPERS, DEVELOPER_GROUPS
+from app.test_github_service import organizations, service  # noqa: F401
+from app.test_query import make_pr
+from app.test_strategy import make_github_pr
+
+
+@pytest.fixture
+def client(service, monkeypatch):
+    monkeypatch.setattr(main_module, "github_service", service)
+    main_module.app.dependency_overrides[get_current_user] = lambda: UserInfo(
+        username="tester", email="tester@example.com"
+    )
+    yield TestClient(main_module.app)
+    main_module.app.dependency_overrides.clear()
+
+
+def use_change_log(monkeypatch, log):
+    """Make `log` the change log of the current worker"""
+    monkeypatch.setattr(main_module, "change_log", log)
+    monkeypatch.setattr(github_service_module, "change_log", log)
+
+
+def test_changes_poll_is_served_by_any_worker(client, service, monkeypatch, tmp_path):
+    """Test that a version from one worker is answered by another without a resync"""
+    path = str(tmp_path / "coordination.db")
+    username = DEVELOPERS[0]
+    for fake in service.clients.values():
+        fake.prs_by_author = {username: [make_github_pr(1, username, 2)]}
+
+    use_change_log(monkeypatch, SharedChangeLog(path))
+    loaded = client.get("/api/pull-requests").json()
+    # Read before the developers' first refresh was recorded
+    assert loaded["version"] == 0
+
+    # A PR is opened, and the next poll lands on another worker
+    for fake in service.clients.values():
+        fake.prs_by_author[username].append(make_github_pr(2, username, 1))
+    clear_all()
+    use_change_log(monkeypatch, SharedChangeLog(path))
+
+    response = client.get(
+        "/api/pull-requests/changes",
+        params={"since": loaded["version"], "epoch": loaded["epoch"]}
+    )
+    assert response.status_code == 200
+    polled = response.json()
+    assert polled["resync_required"] is False
+    assert polled["epoch"] == loaded["epoch"] and polled["version"] == 2
+    assert [(c["change"], c["pr_id"]) for c in polled["changes"]] == [("added", 1001), ("added", 1002)]
+
+    # Nothing new since then
+    polled = client.get(
+        "/api/pull-requests/changes",
+        params={"since": polled["version"], "epoch": polled["epoch"]}
+    ).json()
+    assert polled["resync_required"] is False and polled["changes"] == []
+
+    # A version from another database must be reloaded
+    polled = client.get("/api/pull-requests/changes", params={"since": 1, "epoch": "unknown"}).json()
+    assert polled["resync_required"] is True
+
+
+def test_outage_serves_last_good_data(client, service, monkeypatch):
+    """Test that endpoints answer with last good PRs while every GitHub call fails"""
+    use_change_log(monkeypatch, ChangeLog())
+    username = DEVELOPERS[0]
+    group = next(name for name, members in DEVELOPER_GROUPS.items() if username in members)
+    for fake in service.clients.values():
+        fake.prs_by_author = {username: [make_github_pr(1, username, 2)]}
+    assert client.get("/api/pull-requests").status_code == 200
+
+    clear_all()
+    for fake in service.clients.values():
+        fake.error = GithubException(502, {"message": "Bad Gateway"})
+
+    for path in ("/api/pull-requests", f"/api/groups/{group}/pull-requests"):
+        response = client.get(path)
+        assert response.status_code == 200
+        developers = {d["username"]: d["pull_requests"] for d in response.json()["developers"]}
+        assert [pr["id"] for pr in developers[username]] == [1001]
+
+    rate_limit = client.get("/api/rate-limit").json()
+    assert rate_limit["stale"] is True and rate_limit["remaining"] == 4000
+
+
+def test_full_load_reports_the_version_before_its_data(client, service, monkeypatch):
+    """Test that a change recorded while loading is sent by the next poll"""
+    log = ChangeLog()
+    use_change_log(monkeypatch, log)
+    fetch = service.fetch_all_developer_prs
+
+    def fetch_during_refresh(developers):
+        developer_prs = fetch(developers)
+        # The background refresh records a change after this data was read
+        log.record_refresh("someone", compact_prs([make_pr(9)]))
+        return developer_prs
+
+    monkeypatch.setattr(service, "fetch_all_developer_prs", fetch_during_refresh)
+    loaded = client.get("/api/pull-requests").json()
+    assert loaded["version"] == 0
+
+    monkeypatch.setattr(service, "fetch_all_developer_prs", fetch)
+    polled = client.get(
+        "/api/pull-requests/changes",
+        params={"since": loaded["version"], "epoch": loaded["epoch"]}
+    ).json()
+    assert [(c["username"], c["pr_id"]) for c in polled["changes"]] == [("someone", 9)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
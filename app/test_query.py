@@ -0,0 +1,118 @@
+"""Tests for query module"""
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.compact import compact_prs
+from app.indexes import PRIndex
+from app.models import DeveloperPRs, PullRequest, ReviewComments, PRResponse
+from app.query import (
+    PRQuery, QueryError, filter_developer_prs, paginate,
+    parse_fields, projection
+)
+
+
+def make_pr(pr_id, repository="Realtyka/api", unresolved=0, reviewers=None, age_days=1):
+    """Build a PullRequest with sensible defaults"""
+    return PullRequest(
+        id=pr_id,
+        number=pr_id,
+        title=f"PR {pr_id}",
+        repository=repository,
+        created_at=datetime.now(timezone.utc) - timedelta(days=age_days),
+        url=f"https://github.com/{repository}/pull/{pr_id}",
+        state="open",
+        review_comments=ReviewComments(total=unresolved, resolved=0, unresolved=unresolved),
+        reviewers=reviewers or []
+    )
+
+
+def sample_data():
+    return [
+        DeveloperPRs(username="alice", pull_requests=[
+            make_pr(1, "Realtyka/api", unresolved=3, reviewers=["bob"], age_days=10),
+            make_pr(2, "Realtyka/web", unresolved=0, reviewers=["carol"], age_days=1),
+        ]),
+        DeveloperPRs(username="bob", pull_requests=[
+            make_pr(3, "Realtyka/api", unresolved=1, reviewers=["alice"], age_days=5),
+        ]),
+        DeveloperPRs(username="dave", pull_requests=[]),
+    ]
+
+
+def test_no_filters_returns_data_unchanged():
+    """Test that an empty query does not touch the data"""
+    data = sample_data()
+    assert filter_developer_prs(data, PRQuery()) is data
+
+
+def test_filters():
+    """Test each filter and their combination"""
+    data = sample_data()
+
+    result = filter_developer_prs(data, PRQuery(repo="api"))
+    assert [pr.id for d in result for pr in d.pull_requests] == [1, 3]
+    assert [d.username for d in result] == ["alice", "bob"]
+
+    result = filter_developer_prs(data, PRQuery(repo="Realtyka/WEB"))
+    assert [pr.id for d in result for pr in d.pull_requests] == [2]
+
+    result = filter_developer_prs(data, PRQuery(reviewer="Carol"))
+    assert [pr.id for d in result for pr in d.pull_requests] == [2]
+
+    result = filter_developer_prs(data, PRQuery(min_unresolved=1, older_than=7))
+    assert [pr.id for d in result for pr in d.pull_requests] == [1]
+
+
+def test_age_filter_from_index():
+    """Test that the age index gives the same result as checking every PR"""
+    data = sample_data()
+    index = PRIndex()
+    for developer in data:
+        index.update_developer(developer.username, compact_prs(developer.pull_requests))
+
+    for query in (PRQuery(older_than=0), PRQuery(older_than=7), PRQuery(min_unresolved=1, older_than=7)):
+        aged = index.older_than_ids(query.older_than)
+        assert filter_developer_prs(data, query, aged) == filter_developer_prs(data, query)
+
+
+def test_pagination():
+    """Test walking all pages with cursors"""
+    data = sample_data()
+
+    page, cursor = paginate(data, limit=2)
+    assert [pr.id for d in page for pr in d.pull_requests] == [1, 2]
+    assert cursor is not None
+
+    page, cursor = paginate(data, limit=2, cursor=cursor)
+    assert [pr.id for d in page for pr in d.pull_requests] == [3]
+    assert [d.username for d in page] == ["bob"]
+    assert cursor is None
+
+
+def test_pagination_invalid_cursor():
+    """Test that unknown or malformed cursors are rejected"""
+    with pytest.raises(QueryError):
+        paginate(sample_data(), limit=2, cursor="not-a-cursor")
+
+    with pytest.raises(QueryError):
+        paginate(sample_data(), limit=0)
+
+
+def test_projection():
+    """Test that only requested PR fields are serialized"""
+    response = PRResponse(
+        developers=sample_data()[:1],
+        fetched_at=datetime.now(),
+        rate_limit_remaining=5000
+    )
+    fields = parse_fields("id, repository")
+    data = response.model_dump(mode="json", include=projection(fields))
+
+    assert set(data["developers"][0]["pull_requests"][0].keys()) == {"id", "repository"}
+    assert data["rate_limit_remaining"] == 5000
+
+    with pytest.raises(QueryError):
+        parse_fields("id,nope")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,70 @@
+"""Tests for refresh module"""
+import time
+import pytest
+from app.refresh import RefreshScheduler
+
+
+def test_unknown_developer_gets_default_ttl():
+    """Test the fallback before anything is known"""
+    scheduler = RefreshScheduler(min_ttl=300, max_ttl=7200, default_ttl=1800, call_budget_per_hour=1000)
+    assert scheduler.ttl_for("alice") == 1800
+
+
+def test_busy_viewed_developer_refreshes_more_often():
+    """Test that changing and viewed data gets the shorter TTL"""
+    scheduler = RefreshScheduler(min_ttl=300, max_ttl=7200, call_budget_per_hour=200)
+    now = time.time()
+
+    for i in range(5):
+        scheduler.record_refresh("busy", signature=i, api_calls=10)
+        scheduler.record_refresh("idle", signature=0, api_calls=10)
+    scheduler.record_access(["busy"] * 20, now=now)
+
+    busy, idle = scheduler.ttl_for("busy", now=now), scheduler.ttl_for("idle", now=now)
+    assert 300 <= busy < idle <= 7200
+
+
+def test_budget_is_respected():
+    """Test that planned refreshes stay within the hourly call budget"""
+    scheduler = RefreshScheduler(min_ttl=60, max_ttl=7200, call_budget_per_hour=500)
+    now = time.time()
+
+    for n in range(10):
+        for i in range(3):
+            scheduler.record_refresh(f"dev{n}", signature=i * n, api_calls=20)
+        scheduler.record_access([f"dev{n}"] * n, now=now)
+
+    calls_per_hour = sum(
+        3600 / scheduler.ttl_for(f"dev{n}", now=now) * 20 for n in range(10)
+    )
+    assert calls_per_hour == pytest.approx(500, rel=0.02)
+
+
+def test_ttl_bounds():
+    """Test that TTLs stay within bounds with a large or tiny budget"""
+    generous = RefreshScheduler(min_ttl=300, max_ttl=7200, call_budget_per_hour=10 ** 6)
+    generous.record_refresh("alice", signature=1, api_calls=5)
+    assert generous.ttl_for("alice") == 300
+
+    tight = RefreshScheduler(min_ttl=300, max_ttl=7200, call_budget_per_hour=1)
+    tight.record_refresh("alice", signature=1, api_calls=5)
+    assert tight.ttl_for("alice") == 7200
+
+
+def test_forgotten_developers_release_their_budget():
+    """Test that developers neither requested nor refreshed stop taking budget"""
+    scheduler = RefreshScheduler(min_ttl=60, max_ttl=3600, call_budget_per_hour=100)
+    now = time.time()
+    scheduler.record_refresh("alice", signature=1, api_calls=10, now=now)
+    scheduler.record_access([f"lookup{n}" for n in range(9)], now=now)
+    crowded = scheduler.ttl_for("alice", now=now)
+
+    # Two max TTLs later only alice is still refreshed
+    later = now + 2 * 3600 + 60
+    scheduler.record_refresh("alice", signature=1, api_calls=10, now=later)
+    assert scheduler.ttl_for("alice", now=later) < crowded
+    assert list(scheduler.get_stats()) == ["alice"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
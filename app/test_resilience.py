@@ -0,0 +1,94 @@
+"""Tests for resilience module"""
+import time
+import pytest
+from github import GithubException
+from app.resilience import (
+    CircuitBreaker, CircuitOpenError, ResilientCaller, RetryPolicy, server_delay
+)
+
+
+def failing(*errors):
+    """Callable raising the given errors in turn, then returning "ok" """
+    errors = list(errors)
+    calls = []
+
+    def func():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    func.calls = calls
+    return func
+
+
+def test_retries_transient_errors():
+    """Test that 502s are retried with backoff"""
+    sleeps = []
+    caller = ResilientCaller(RetryPolicy(attempts=3, base_delay=1, max_delay=10), sleep=sleeps.append)
+    func = failing(GithubException(502), GithubException(502))
+
+    assert caller.call("search", func) == "ok"
+    assert len(func.calls) == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 1 and 0 <= sleeps[1] <= 2
+
+
+def test_does_not_retry_client_errors():
+    """Test that 404s are raised right away"""
+    caller = ResilientCaller(RetryPolicy(attempts=3), sleep=lambda _: None)
+    func = failing(GithubException(404))
+
+    with pytest.raises(GithubException):
+        caller.call("pulls", func)
+    assert len(func.calls) == 1
+    assert caller.breaker("pulls").state == "closed"
+
+
+def test_honours_retry_after():
+    """Test that Retry-After is used as delay, or opens the circuit if too long"""
+    sleeps = []
+    caller = ResilientCaller(RetryPolicy(attempts=2, max_delay=10), sleep=sleeps.append)
+    secondary = GithubException(403, {"message": "secondary rate limit"}, {"Retry-After": "3"})
+
+    assert caller.call("search", failing(secondary)) == "ok"
+    assert sleeps == [3.0]
+
+    long_wait = GithubException(403, {"message": "secondary rate limit"}, {"retry-after": "120"})
+    with pytest.raises(GithubException):
+        caller.call("search", failing(long_wait))
+    assert caller.breaker("search").state == "open"
+    with pytest.raises(CircuitOpenError):
+        caller.call("search", failing())
+
+
+def test_server_delay_from_rate_limit_reset():
+    """Test X-RateLimit-Reset parsing"""
+    now = time.time()
+    exc = GithubException(403, None, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(int(now) + 30)})
+    assert 29 <= server_delay(exc, now=now) <= 30
+    assert server_delay(GithubException(502)) is None
+
+
+def test_circuit_breaker_half_open():
+    """Test opening, rejecting and closing after a trial call"""
+    breaker = CircuitBreaker("comments", threshold=2, reset_seconds=0.05)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial call
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.get_stats()["rejections"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
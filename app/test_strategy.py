@@ -0,0 +1,140 @@
+"""Tests for strategy module"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import pytest
+from app.github_service import GitHubService
+from app.strategy import AUTHOR, REPOSITORY, FetchStrategySelector, pages
+
+NOW = datetime(2026, 1, 10, tzinfo=timezone.utc)
+API = "https://api.github.com/repos"
+
+
+def make_comment(login, days_ago, number, review=True, position=1):
+    created_at = NOW - timedelta(days=days_ago)
+    url_field = "pull_request_url" if review else "issue_url"
+    kind = "pulls" if review else "issues"
+    return SimpleNamespace(**{
+        "user": SimpleNamespace(login=login),
+        "created_at": created_at,
+        "updated_at": created_at,
+        "position": position,
+        url_field: f"{API}/Realtyka/api/{kind}/{number}",
+    })
+
+
+def make_github_pr(number, author, days_ago, review_comments=(), issue_comments=()):
+    return SimpleNamespace(
+        id=1000 + number,
+        number=number,
+        title=f"PR {number}",
+        base=SimpleNamespace(repo=SimpleNamespace(full_name="Realtyka/api")),
+        created_at=NOW - timedelta(days=days_ago),
+        html_url=f"https://github.com/Realtyka/api/pull/{number}",
+        state="open",
+        user=SimpleNamespace(login=author),
+        get_review_comments=lambda: list(review_comments),
+        get_issue_comments=lambda: list(issue_comments),
+    )
+
+
+class FakeRepo:
+    def __init__(self, pulls, review_comments, issue_comments):
+        self.pulls = pulls
+        self.review_comments = review_comments
+        self.issue_comments = issue_comments
+
+    def get_pulls(self, state):
+        return self.pulls
+
+    def get_pulls_review_comments(self, since):
+        return [c for c in self.review_comments if c.updated_at >= since]
+
+    def get_issues_comments(self, since):
+        return [c for c in self.issue_comments if c.updated_at >= since]
+
+
+class FakeClient:
+    def __init__(self, repo):
+        self.repo = repo
+
+    def search_issues(self, query):
+        authors = {token[len("author:"):].lower() for token in query.split() if token.startswith("author:")}
+        return [
+            SimpleNamespace(url=f"{API}/Realtyka/api/issues/{pr.number}", as_pull_request=lambda pr=pr: pr)
+            for pr in self.repo.pulls
+            if pr.user.login.lower() in authors
+        ]
+
+    def get_repo(self, full_name, lazy=False):
+        assert full_name == "Realtyka/api"
+        return self.repo
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+    alice_review = [make_comment("bob", 3, 1), make_comment("carol", 2, 1, position=None)]
+    alice_issue = [make_comment("bob", 1, 1, review=False)]
+    bob_review = [make_comment("alice", 4, 3)]
+    pulls = [
+        make_github_pr(1, "Alice", 5, alice_review, alice_issue),
+        make_github_pr(2, "carol", 6),
+        make_github_pr(3, "bob", 4, bob_review),
+    ]
+    # Comments on a closed PR and an old one that predates every tracked PR
+    other_review = [make_comment("dave", 1, 99), make_comment("dave", 30, 2)]
+    repo = FakeRepo(pulls, alice_review + bob_review + other_review, alice_issue)
+
+    github_service = GitHubService()
+    github_service.tracked_developers = ["alice", "bob"]
+    github_service.clients = {org: FakeClient(repo) for org in github_service.organizations}
+    return github_service
+
+
+def test_repository_strategy_matches_author_strategy(service):
+    """Test that bulk fetching per repository returns the same PRs per developer"""
+    org = service.organizations[0]
+    by_repository, repository_calls = service._fetch_org_prs_by_repository(org)
+
+    for username in ("alice", "bob"):
+        by_author, _ = service._fetch_org_prs_by_author(org, username)
+        assert by_repository[username] == by_author
+
+    alice = by_repository["alice"][0]
+    assert alice.review_comments.total == 2
+    assert alice.review_comments.unresolved == 1
+    assert sorted(alice.reviewers) == ["bob", "carol"]
+    # One search, then one page each of pulls, review comments and issue comments
+    assert repository_calls == 4
+
+
+def test_author_strategy_counts_calls(service):
+    """Test that every search page, PR and comment page is counted"""
+    _, calls = service._fetch_org_prs_by_author(service.organizations[0], "alice")
+    assert calls == 1 + (1 + 1 + 1)
+    assert pages(0) == 1 and pages(100) == 1 and pages(101) == 2
+
+
+def test_selector_tries_both_then_prefers_cheaper():
+    """Test measuring each strategy once, then picking the cheaper one"""
+    selector = FetchStrategySelector(mode="auto", explore_every=5)
+
+    assert selector.choose("org") == AUTHOR
+    selector.record("org", AUTHOR, calls=40, developers=1)
+    assert selector.choose("org") == REPOSITORY
+    selector.record("org", REPOSITORY, calls=30, developers=6)
+
+    choices = [selector.choose("org") for _ in range(10)]
+    assert choices.count(REPOSITORY) == 8
+    assert choices[4] == choices[9] == AUTHOR
+
+
+def test_selector_fixed_mode():
+    """Test that a configured strategy is always used"""
+    assert FetchStrategySelector(mode="author").choose("org") == AUTHOR
+    with pytest.raises(ValueError):
+        FetchStrategySelector(mode="fastest")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+"""Tests for subscriptions module"""
+import asyncio
+import json
+import threading
+import pytest
+from app.changes import ChangeLog
+from app.compact import compact_prs
+from app.subscriptions import SubscriptionHub, RESYNC_MESSAGE
+from app.test_query import make_pr
+
+
+def drain(subscriber):
+    messages = []
+    while not subscriber.queue.empty():
+        messages.append(subscriber.queue.get_nowait())
+    return messages
+
+
+def test_changes_are_encoded_once_for_all_subscribers():
+    """Test fan-out to subscribers of a developer only"""
+    async def scenario():
+        hub = SubscriptionHub(queue_size=10)
+        log = ChangeLog()
+        alice_1, alice_2, bob_only = hub.connect(), hub.connect(), hub.connect()
+        hub.subscribe(alice_1, ["alice"])
+        hub.subscribe(alice_2, ["alice", "bob"])
+        hub.subscribe(bob_only, ["bob"])
+
+        changes = log.record_refresh("alice", compact_prs([make_pr(1)]))
+        hub.publish_changes("alice", changes, log.epoch)
+
+        first, second = drain(alice_1), drain(alice_2)
+        assert drain(bob_only) == []
+        assert first[0] is second[0]
+        message = json.loads(first[0])
+        assert message["type"] == "changes"
+        assert message["version"] == 1
+        assert message["changes"][0]["pull_request"]["id"] == 1
+
+        hub.disconnect(alice_2)
+        assert sorted(hub.subscribed_developers()) == ["alice", "bob"]
+        hub.unsubscribe(alice_1, ["alice"])
+        assert hub.subscribed_developers() == ["bob"]
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_gets_resync_instead_of_backlog():
+    """Test that a full queue is replaced by a single resync message"""
+    async def scenario():
+        hub = SubscriptionHub(queue_size=3)
+        subscriber = hub.connect()
+        for remaining in range(5):
+            hub.publish_rate_limit({"remaining": remaining})
+        messages = drain(subscriber)
+        assert messages[0] == RESYNC_MESSAGE
+        assert [json.loads(m)["remaining"] for m in messages[1:]] == [4]
+        assert hub.get_stats()["overflows"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_unchanged_rate_limit_is_not_pushed():
+    """Test that rate limit messages are only sent on change"""
+    async def scenario():
+        hub = SubscriptionHub()
+        subscriber = hub.connect()
+        hub.publish_rate_limit({"remaining": 10})
+        hub.publish_rate_limit({"remaining": 10})
+        assert len(drain(subscriber)) == 1
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_another_thread():
+    """Test that refreshes on worker threads are delivered on the event loop"""
+    async def scenario():
+        hub = SubscriptionHub()
+        subscriber = hub.connect()
+        thread = threading.Thread(target=hub.publish_rate_limit, args=({"remaining": 1},))
+        thread.start()
+        thread.join()
+        message = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+        assert json.loads(message) == {"type": "rate_limit", "remaining": 1}
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
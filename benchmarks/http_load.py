@@ -0,0 +1,309 @@
+"""
+End-to-end HTTP load test for the API layer
+
+Runs the app with a local stand-in for GitHub (synthetic PRs, optional
+simulated GitHub latency) and a pre-seeded cache, then drives mixed
+authenticated traffic at fixed concurrency levels and reports throughput and
+p50/p95/p99 latency per route, concurrency level and gunicorn worker count.
+
+Usage:
+    # Spawn gunicorn with 1, 2 and 4 workers and test each
+    python -m benchmarks.http_load --workers 1,2,4 --concurrency 1,16,64 --duration 15
+
+    # In-process, no server (measures app + serialization only)
+    python -m benchmarks.http_load --in-process
+
+    # Against an already running server started with
+    # `gunicorn benchmarks.http_load:app -k uvicorn.workers.UvicornWorker`
+    python -m benchmarks.http_load --url http://127.0.0.1:8000
+
+The stand-in is configured through environment variables so gunicorn
+workers pick it up: LOADTEST_PRS_PER_DEVELOPER (default 20),
+LOADTEST_GITHUB_LATENCY_MS (default 0) and LOADTEST_SEED_CACHE (default 1).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Keep load tests away from the real history file, coordination database
+# and GitHub credentials
+os.environ.setdefault("HISTORY_PATH", "")
+os.environ.setdefault("LEADER_DB_PATH", "")
+os.environ.setdefault("GITHUB_TOKEN", "load-test")
+
+import httpx
+
+import app.main as main
+from app.aggregates import percentile
+from app.auth import create_access_token
+from app.compact import CompactPR
+from app.config import DEVELOPERS, DEVELOPER_GROUPS
+from app.github_service import GitHubService, prs_cache
+
+PRS_PER_DEVELOPER = int(os.getenv("LOADTEST_PRS_PER_DEVELOPER", "20"))
+GITHUB_LATENCY_MS = float(os.getenv("LOADTEST_GITHUB_LATENCY_MS", "0"))
+SEED_CACHE = os.getenv("LOADTEST_SEED_CACHE", "1") == "1"
+
+# Route label, weight, path template
+TRAFFIC_MIX = [
+    ("pull-requests", 30, "/api/pull-requests"),
+    ("group", 25, "/api/groups/{group}/pull-requests"),
+    ("developer", 20, "/api/developers/{developer}/pull-requests"),
+    ("auth-me", 15, "/api/auth/me"),
+    ("cache-stats", 10, "/api/cache/stats"),
+]
+
+
+class StandInGitHubService(GitHubService):
+    """GitHubService answering from synthetic data instead of the GitHub API"""
+
+    def get_rate_limit_info(self) -> Dict[str, int]:
+        return {"remaining": 5000, "limit": 5000, "reset_time": time.time() + 3600, "organizations": {}}
+
+    def _fetch_org_prs(self, org: str, username: str):
+        cache_key = f"prs:{org}:{username}"
+        cached_prs = prs_cache.get(cache_key)
+        if cached_prs is not None:
+            return cached_prs, "ok"
+
+        if GITHUB_LATENCY_MS:
+            time.sleep(GITHUB_LATENCY_MS / 1000)
+
+        records = synthetic_records(org, username, PRS_PER_DEVELOPER)
+        prs_cache.set(cache_key, records, ttl_seconds=1800)
+        return records, "ok"
+
+
+def synthetic_records(org: str, username: str, count: int) -> Tuple[CompactPR, ...]:
+    """Deterministic PR records for a developer"""
+    rng = random.Random(zlib.crc32(f"{org}/{username}".encode()))
+    now = datetime.now(timezone.utc)
+    records = []
+    for i in range(count):
+        number = rng.randint(1, 9999)
+        created_at = now - timedelta(hours=rng.randint(1, 2000))
+        unresolved = rng.randint(0, 5)
+        resolved = rng.randint(0, 5)
+        reviewers = tuple(sorted(set(rng.sample(DEVELOPERS, k=min(len(DEVELOPERS), rng.randint(0, 3))))))
+        first_comment = created_at + timedelta(hours=rng.randint(1, 48)) if reviewers else None
+        records.append(CompactPR(
+            id=zlib.crc32(f"{org}/{username}/{i}".encode()),
+            number=number,
+            title=f"Synthetic change {i} by {username}",
+            repository=f"{org}/repository-{rng.randint(1, 8)}",
+            url=None,
+            state="open",
+            total_comments=resolved + unresolved,
+            resolved_comments=resolved,
+            unresolved_comments=unresolved,
+            reviewers=reviewers,
+            created_ts=created_at.timestamp(),
+            first_comment_ts=first_comment.timestamp() if first_comment else None,
+            last_comment_ts=(first_comment + timedelta(hours=3)).timestamp() if first_comment else None,
+            last_comment_by=reviewers[-1] if reviewers else None
+        ))
+    return tuple(records)
+
+
+async def install_stand_in():
+    """Replace the GitHub service after the app's own startup and seed the cache"""
+    service = StandInGitHubService()
+    main.github_service = service
+    if SEED_CACHE:
+        service.fetch_all_developer_prs(DEVELOPERS)
+        for group_developers in DEVELOPER_GROUPS.values():
+            service.fetch_all_developer_prs(group_developers)
+
+
+# ASGI app for gunicorn: the real app with the stand-in installed on startup
+app = main.app
+app.router.on_startup.append(install_stand_in)
+
+
+class Recorder:
+    """Collects latencies and errors per route"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {label: [] for label, _, _ in TRAFFIC_MIX}
+        self.errors: Dict[str, int] = {label: 0 for label, _, _ in TRAFFIC_MIX}
+
+    def report(self, duration: float) -> Dict[str, Dict[str, float]]:
+        rows = {}
+        for label, latencies in self.latencies.items():
+            latencies.sort()
+            rows[label] = {
+                "requests": len(latencies),
+                "errors": self.errors[label],
+                "rps": len(latencies) / duration,
+                "p50_ms": (percentile(latencies, 50) or 0) * 1000,
+                "p95_ms": (percentile(latencies, 95) or 0) * 1000,
+                "p99_ms": (percentile(latencies, 99) or 0) * 1000,
+            }
+        total = sum(row["requests"] for row in rows.values())
+        all_latencies = sorted(l for latencies in self.latencies.values() for l in latencies)
+        rows["total"] = {
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "rps": total / duration,
+            "p50_ms": (percentile(all_latencies, 50) or 0) * 1000,
+            "p95_ms": (percentile(all_latencies, 95) or 0) * 1000,
+            "p99_ms": (percentile(all_latencies, 99) or 0) * 1000,
+        }
+        return rows
+
+
+def pick_request(rng: random.Random) -> Tuple[str, str]:
+    """Pick a route from the traffic mix and fill in its path"""
+    label, _, template = rng.choices(TRAFFIC_MIX, weights=[w for _, w, _ in TRAFFIC_MIX])[0]
+    path = template.format(
+        group=rng.choice(list(DEVELOPER_GROUPS)),
+        developer=rng.choice(DEVELOPERS)
+    )
+    return label, path
+
+
+async def virtual_user(client: httpx.AsyncClient, user_id: int, deadline: float, recorder: Recorder):
+    """Issue requests back to back until the deadline"""
+    rng = random.Random(user_id)
+    token = create_access_token({
+        "username": f"load-user-{user_id}",
+        "email": f"load-user-{user_id}@example.com"
+    })
+    headers = {"Authorization": f"Bearer {token}"}
+
+    while time.perf_counter() < deadline:
+        label, path = pick_request(rng)
+        start = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        elapsed = time.perf_counter() - start
+        if ok:
+            recorder.latencies[label].append(elapsed)
+        else:
+            recorder.errors[label] += 1
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int, duration: float, warmup: float):
+    """Run one concurrency level, after a short warm-up"""
+    if warmup:
+        await asyncio.gather(*(
+            virtual_user(client, i, time.perf_counter() + warmup, Recorder())
+            for i in range(concurrency)
+        ))
+
+    recorder = Recorder()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(client, i, start + duration, recorder)
+        for i in range(concurrency)
+    ))
+    return recorder.report(time.perf_counter() - start)
+
+
+def print_report(workers: str, concurrency: int, rows: Dict[str, Dict[str, float]]):
+    print(f"\nworkers={workers} concurrency={concurrency}")
+    print(f"  {'route':<15}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, row in rows.items():
+        print(
+            f"  {label:<15}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10.1f}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+        )
+
+
+async def run_against(client: httpx.AsyncClient, workers: str, args, results: list):
+    for concurrency in args.concurrency:
+        rows = await run_level(client, concurrency, args.duration, args.warmup)
+        print_report(workers, concurrency, rows)
+        results.append({"workers": workers, "concurrency": concurrency, "routes": rows})
+
+
+async def wait_until_ready(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+def start_gunicorn(workers: int, port: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "benchmarks.http_load:app",
+            "-w", str(workers),
+            "-k", "uvicorn.workers.UvicornWorker",
+            "--bind", f"127.0.0.1:{port}",
+            "--log-level", "warning",
+        ],
+        env=os.environ.copy()
+    )
+
+
+async def main_async(args) -> list:
+    results = []
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    timeout = httpx.Timeout(30)
+
+    if args.in_process:
+        await main.app.router.startup()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=timeout) as client:
+            await run_against(client, "in-process", args, results)
+        await main.app.router.shutdown()
+    elif args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+            await run_against(client, "external", args, results)
+    else:
+        for workers in args.workers:
+            process = start_gunicorn(workers, args.port)
+            try:
+                url = f"http://127.0.0.1:{args.port}"
+                await wait_until_ready(url)
+                async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as client:
+                    await run_against(client, str(workers), args, results)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+    return results
+
+
+def int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Test an already running server")
+    target.add_argument("--in-process", action="store_true", help="Test the ASGI app without a server")
+    parser.add_argument("--workers", type=int_list, default=[1, 2, 4], help="Gunicorn worker counts, e.g. 1,2,4")
+    parser.add_argument("--concurrency", type=int_list, default=[1, 8, 32], help="Concurrent clients, e.g. 1,8,32")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2, help="Warm-up seconds before each level")
+    parser.add_argument("--port", type=int, default=8765, help="Port for spawned gunicorn servers")
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    all_results = asyncio.run(main_async(arguments))
+    if arguments.json:
+        with open(arguments.json, "w") as f:
+            json.dump(all_results, f, indent=2)
@@ -0,0 +1,106 @@
+"""
+Memory benchmark for cached PR data
+
+Builds a synthetic org-wide data set and measures, with tracemalloc, how much
+memory the cache holds for it when storing Pydantic models (the previous
+layout, with `prs:` and `all_prs:` entries) versus compact records.
+
+Usage:
+    python -m benchmarks.memory_usage --developers 200 --prs-per-developer 25
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from app.compact import compact_prs
+from app.models import DeveloperPRs, PullRequest, ReviewComments
+
+
+def build_models(developers: int, prs_per_developer: int, repositories: int, seed: int = 1):
+    """Generate PR models the way the GitHub service builds them"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    logins = [f"developer-{i}" for i in range(developers)]
+    repos = [f"Realtyka/repository-{i}" for i in range(repositories)]
+    data = {}
+    pr_id = 0
+
+    for login in logins:
+        prs = []
+        for _ in range(prs_per_developer):
+            pr_id += 1
+            # Strings are rebuilt per PR, as they are when decoded from GitHub JSON
+            repository = "".join(rng.choice(repos))
+            created_at = now - timedelta(hours=rng.randint(1, 2000))
+            unresolved = rng.randint(0, 5)
+            resolved = rng.randint(0, 5)
+            reviewers = ["".join(rng.choice(logins)) for _ in range(rng.randint(0, 4))]
+            first_comment = created_at + timedelta(hours=rng.randint(1, 48)) if reviewers else None
+            prs.append(PullRequest(
+                id=pr_id,
+                number=pr_id % 10000,
+                title=f"Implement feature {pr_id}",
+                repository=repository,
+                created_at=created_at,
+                url=f"https://github.com/{repository}/pull/{pr_id % 10000}",
+                state="".join("open"),
+                review_comments=ReviewComments(
+                    total=resolved + unresolved,
+                    resolved=resolved,
+                    unresolved=unresolved
+                ),
+                reviewers=reviewers,
+                first_comment_date=first_comment,
+                last_comment_date=first_comment + timedelta(hours=5) if first_comment else None,
+                last_comment_by="".join(reviewers[-1]) if reviewers else None
+            ))
+        data[login] = prs
+    return data
+
+
+def measure(build) -> int:
+    """Bytes still allocated by the object graph returned from `build`"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--developers", type=int, default=200)
+    parser.add_argument("--prs-per-developer", type=int, default=25)
+    parser.add_argument("--repositories", type=int, default=40)
+    args = parser.parse_args()
+
+    def model_cache():
+        models = build_models(args.developers, args.prs_per_developer, args.repositories)
+        return {
+            "prs": models,
+            "all_prs": [DeveloperPRs(username=u, pull_requests=p) for u, p in models.items()],
+        }
+
+    def compact_cache():
+        models = build_models(args.developers, args.prs_per_developer, args.repositories)
+        records = {u: compact_prs(p) for u, p in models.items()}
+        del models
+        return {"prs": records, "all_prs": tuple(records.items())}
+
+    total = args.developers * args.prs_per_developer
+    models_bytes = measure(model_cache)
+    compact_bytes = measure(compact_cache)
+
+    print(f"PRs cached:        {total}")
+    print(f"Pydantic models:   {models_bytes / 1024:10.1f} KiB ({models_bytes / total:.0f} B/PR)")
+    print(f"Compact records:   {compact_bytes / 1024:10.1f} KiB ({compact_bytes / total:.0f} B/PR)")
+    print(f"Reduction:         {(1 - compact_bytes / models_bytes) * 100:10.1f}%")
+
+
+if __name__ == "__main__":
+    main()